@@ -0,0 +1,53 @@
+"""
+Disk-backed result cache for benchmark runs.
+
+Analyses are keyed on a SHA-256 of the canonical JSON encoding of
+(model, prompt template, context, text), so re-running the same model and
+prompt over the same dataset returns instantly instead of re-querying Ollama,
+while any prompts.yaml edit misses and is measured afresh.
+"""
+import hashlib
+import json
+import os
+from typing import Any, Callable, Optional, Tuple
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+def cache_key(key_tuple: Tuple[Any, ...]) -> str:
+    """Stable hex digest for a tuple of JSON-serialisable values."""
+    canonical = json.dumps(list(key_tuple), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_or_compute(
+    key_tuple: Tuple[Any, ...],
+    fn: Callable[[], Any],
+    cache_dir: str = CACHE_DIR,
+    cacheable: Optional[Callable[[Any], bool]] = None,
+) -> Tuple[Any, bool]:
+    """
+    Return (value, cache_hit). On a miss, call fn() and persist its result
+    unless it is empty or rejected by the `cacheable` predicate.
+    """
+    path = os.path.join(cache_dir, f"{cache_key(key_tuple)}.json")
+
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f), True
+        except (OSError, json.JSONDecodeError):
+            pass  # Corrupt entry, recompute below
+
+    value = fn()
+    if value and (cacheable is None or cacheable(value)):
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temp file first so concurrent workers never read a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+    return value, False
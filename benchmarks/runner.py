@@ -1,14 +1,19 @@
 import json
+import re
 import time
 import sys
 import os
 import argparse
-from typing import List, Dict, Any
+import statistics
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
 
 # Add project root to path so we can import src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.analysis.llm_client import OllamaClient
+from benchmarks import _cache
 
 # Standard context for the benchmark
 BENCHMARK_CONTEXT = """
@@ -19,100 +24,225 @@ Goals: Expand preventive health screening reach across the UK; Promote early det
 COMPETITORS: Nuffield Health, Randox Health, Bupa.
 """
 
+RESULTS_PATH = "benchmarks/results.json"
+# One model result per line, appended as each model finishes so a crashed run keeps its progress
+RESULTS_JSONL_PATH = "benchmarks/results.jsonl"
+
+# Minimum seconds between progress lines while a model is being evaluated
+PROGRESS_INTERVAL_S = 1.0
+
+# Short article used to exercise the full analysis path during warmup
+WARMUP_PROBE = "Short probe: a UK employer announced a new staff health screening scheme."
+
+# First run of digits in a free-form score like "7 (High)" or "Score: 7"
+_SCORE_RE = re.compile(r"\d+")
+
+# Score band (inclusive) that counts as a match for each expected relevance label
+_EXPECTED_BANDS = {
+    "high": (7, float("inf")),
+    "medium": (4, 6),
+    "low": (float("-inf"), 3),
+}
+
+@dataclass
+class WarmupProfile:
+    """Per-request latencies for the warmup probes and where they level off."""
+    per_request_ms: List[float] = field(default_factory=list)
+    stabilization_index: Optional[int] = None
+    cold_start_penalty_ms: float = 0.0
+    warmup_duration_s: float = 0.0
+
+    @classmethod
+    def from_latencies(cls, latencies_ms: List[float], window: int = 3) -> "WarmupProfile":
+        profile = cls(per_request_ms=latencies_ms, warmup_duration_s=sum(latencies_ms) / 1000)
+        if not latencies_ms:
+            return profile
+
+        # Stable once a window of consecutive requests varies by < 10% of its mean
+        for i in range(len(latencies_ms) - window + 1):
+            chunk = latencies_ms[i:i + window]
+            mean = statistics.mean(chunk)
+            if mean and statistics.stdev(chunk) < 0.1 * mean:
+                profile.stabilization_index = i
+                break
+
+        steady = latencies_ms[profile.stabilization_index:] if profile.stabilization_index is not None else latencies_ms[1:]
+        if steady:
+            profile.cold_start_penalty_ms = latencies_ms[0] - statistics.mean(steady)
+        return profile
+
 def load_dataset(path: str) -> List[Dict[str, Any]]:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+def prepare_dataset(dataset: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Build each item's analysis text once so multi-model runs don't redo it per model."""
+    for item in dataset:
+        # We'll use the title + content as the text to analyze
+        item["_full_text"] = f"{item['title']}\n\n{item['content']}"
+    return dataset
+
 def _parse_score(score_val: Any) -> int:
     """Helper to safely parse relevance score to int."""
+    # bool is an int subclass; True/False is not a meaningful score
+    if isinstance(score_val, bool):
+        return 0
     if isinstance(score_val, int):
         return score_val
     if isinstance(score_val, float):
         return int(score_val)
     if isinstance(score_val, str):
         # Handle cases like "7" or "7 (High)" or "Score: 7"
-        import re
-        # Find the first sequence of digits
-        match = re.search(r'\d+', score_val)
+        match = _SCORE_RE.search(score_val)
         if match:
             return int(match.group())
     return 0
 
-def evaluate_model(model_name: str, dataset: List[Dict[str, Any]], base_url: str) -> Dict[str, Any]:
+def _is_match(expected: Optional[str], score: int) -> bool:
+    """Simple heuristic for accuracy: "high" -> 7-10, "medium" -> 4-6, "low" -> 1-3."""
+    band = _EXPECTED_BANDS.get(expected)
+    return band is not None and band[0] <= score <= band[1]
+
+def _is_cacheable(analysis: Dict[str, Any]) -> bool:
+    """Don't persist the client's failure placeholder."""
+    return analysis.get("relevance_reasoning") != "Analysis failed"
+
+def _analyze_item(client: OllamaClient, item: Dict[str, Any], use_cache: bool = True) -> Tuple[Dict[str, Any], float, bool]:
+    """Run a single analysis and time it from execution start (not submit time)."""
+    t0 = time.perf_counter()
+    full_text = item.get("_full_text") or f"{item['title']}\n\n{item['content']}"
+    
+    def compute():
+        return client.analyze_article(full_text, context=BENCHMARK_CONTEXT)
+    
+    if use_cache:
+        # Key on the template the client will render, so prompt edits aren't served stale scores
+        analysis, cache_hit = _cache.get_or_compute(
+            (client.model, client._analysis_template(), BENCHMARK_CONTEXT, full_text),
+            compute,
+            cacheable=_is_cacheable,
+        )
+    else:
+        analysis, cache_hit = compute(), False
+    return analysis, time.perf_counter() - t0, cache_hit
+
+def _run_warmup(client: OllamaClient, probes: int) -> WarmupProfile:
+    """Fire `probes` serial analysis calls so the first real article doesn't absorb cold-start cost."""
+    latencies_ms = []
+    for _ in range(probes):
+        t0 = time.perf_counter()
+        client.analyze_article(WARMUP_PROBE, context=BENCHMARK_CONTEXT)
+        latencies_ms.append((time.perf_counter() - t0) * 1000)
+    return WarmupProfile.from_latencies(latencies_ms)
+
+def evaluate_model(model_name: str, dataset: List[Dict[str, Any]], base_url: str, concurrency: int = 4, use_cache: bool = True, warmup_probes: int = 2, warmup_profile: bool = False) -> Dict[str, Any]:
     print(f"\nEvaluating model: {model_name}...")
     client = OllamaClient(base_url=base_url, model=model_name)
     
-    # Warmup
+    # Warmup (kept serial so warmup_time stays meaningful, excluded from total_time)
     start_warm = time.time()
     if not client.warmup():
         print(f"  Warning: Model {model_name} failed to warmup.")
+    profile = _run_warmup(client, warmup_probes)
     warmup_time = time.time() - start_warm
     
     results = {
         "model": model_name,
         "warmup_time": warmup_time,
+        "concurrency": concurrency,
         "total_time": 0,
         "avg_time_per_doc": 0,
+        "cache_hits": 0,
+        "avg_cached_time": 0,
         "articles": []
     }
+    if warmup_profile:
+        results["warmup_profile"] = asdict(profile)
+        print(f"  Warmup: {[round(ms) for ms in profile.per_request_ms]} ms | "
+              f"Stable at: {profile.stabilization_index} | Cold-start penalty: {profile.cold_start_penalty_ms:.0f} ms")
     
     start_run = time.time()
+    articles: List[Dict[str, Any]] = [None] * len(dataset)
     
-    for item in dataset:
-        print(f"  Processing: {item['id']}...", end="", flush=True)
-        t0 = time.time()
-        
-        # We'll use the title + content as the text to analyze
-        full_text = f"{item['title']}\n\n{item['content']}"
+    # Ollama serves up to OLLAMA_NUM_PARALLEL requests at once, so keep that many in flight
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {
+            executor.submit(_analyze_item, client, item, use_cache): i
+            for i, item in enumerate(dataset)
+        }
         
-        try:
-            analysis = client.analyze_article(full_text, context=BENCHMARK_CONTEXT)
-            duration = time.time() - t0
+        done = 0
+        last_progress = time.perf_counter()
+        for future in as_completed(futures):
+            i = futures[future]
+            item = dataset[i]
             
-            # Simple heuristic for accuracy based on expected relevance
-            # "high" -> 7-10, "medium" -> 4-6, "low" -> 1-3
-            raw_score = analysis.get("relevance_score", 0)
-            score = _parse_score(raw_score)
-            expected = item.get("expected_relevance")
-            
-            match = False
-            if expected == "high" and score >= 7: match = True
-            elif expected == "medium" and 4 <= score <= 6: match = True
-            elif expected == "low" and score <= 3: match = True
-            
-            print(f" {duration:.2f}s | Score: {score} ({expected}) | Match: {'✅' if match else '❌'}")
-            
-            results["articles"].append({
-                "id": item["id"],
-                "duration": duration,
-                "score": score,
-                "raw_score": raw_score,
-                "expected": expected,
-                "match": match,
-                "reasoning": analysis.get("relevance_reasoning"),
-                "summary": analysis.get("summary")
-            })
-            
-        except Exception as e:
-            print(f" Error: {e}")
-            results["articles"].append({
-                "id": item["id"],
-                "error": str(e)
-            })
+            try:
+                analysis, duration, cache_hit = future.result()
+                
+                raw_score = analysis.get("relevance_score", 0)
+                score = _parse_score(raw_score)
+                expected = item.get("expected_relevance")
+                match = _is_match(expected, score)
+                
+                hit_marker = " (cached)" if cache_hit else ""
+                if not match:
+                    print(f"  {item['id']}: {duration:.2f}s{hit_marker} | Score: {score} ({expected}) | Match: ❌")
+                
+                articles[i] = {
+                    "id": item["id"],
+                    "duration": duration,
+                    "cache_hit": cache_hit,
+                    "score": score,
+                    "raw_score": raw_score,
+                    "expected": expected,
+                    "match": match,
+                    "reasoning": analysis.get("relevance_reasoning"),
+                    "summary": analysis.get("summary")
+                }
+                
+            except Exception as e:
+                print(f"  {item['id']}: Error: {e}")
+                articles[i] = {
+                    "id": item["id"],
+                    "error": str(e)
+                }
 
+            # Matches only show up in a throttled progress line; mismatches and errors are printed as they land
+            done += 1
+            now = time.perf_counter()
+            if done == len(dataset) or now - last_progress >= PROGRESS_INTERVAL_S:
+                print(f"  [{done}/{len(dataset)}] {model_name}")
+                last_progress = now
+
+    # Preserve dataset order in the report regardless of completion order
+    results["articles"] = articles
     results["total_time"] = time.time() - start_run
-    if dataset:
-        results["avg_time_per_doc"] = results["total_time"] / len(dataset)
+    # Cache hits return in microseconds; averaging them in with the model's
+    # analyses would make a warm cache look like a faster model, so the per-doc
+    # figure covers analysed articles only and hits are reported apart
+    hit_times = [a["duration"] for a in articles if a.get("cache_hit")]
+    analyzed = sum(1 for a in articles if "duration" in a and not a["cache_hit"])
+    results["cache_hits"] = len(hit_times)
+    if hit_times:
+        results["avg_cached_time"] = statistics.mean(hit_times)
+    if analyzed:
+        results["avg_time_per_doc"] = results["total_time"] / analyzed
         
     return results
 
+def append_result(result: Dict[str, Any], path: str = RESULTS_JSONL_PATH):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result, ensure_ascii=False, separators=(",", ":")))
+        f.write("\n")
+
 def print_report(all_results: List[Dict[str, Any]]):
     print("\n" + "="*80)
     print(f"{'BENCHMARK REPORT':^80}")
     print("="*80)
     
     # Summary Table
-    print(f"{'Model':<30} | {'Warmup':<8} | {'Avg (s)':<8} | {'Accuracy':<8} | {'Total (s)':<8}")
+    print(f"{'Model':<30} | {'Warmup':<8} | {'Avg (s)':<8} | {'Accuracy':<8} | {'Total (s)':<8} | {'Cached':<6}")
     print("-" * 80)
     
     for res in all_results:
@@ -120,7 +250,7 @@ def print_report(all_results: List[Dict[str, Any]]):
         matches = sum(1 for a in articles if a.get("match"))
         accuracy = (matches / len(articles)) * 100 if articles else 0
         
-        print(f"{res['model']:<30} | {res['warmup_time']:<8.2f} | {res['avg_time_per_doc']:<8.2f} | {accuracy:<7.0f}% | {res['total_time']:<8.2f}")
+        print(f"{res['model']:<30} | {res['warmup_time']:<8.2f} | {res['avg_time_per_doc']:<8.2f} | {accuracy:<7.0f}% | {res['total_time']:<8.2f} | {res['cache_hits']:<6}")
 
     print("\nDetailed Failures:")
     for res in all_results:
@@ -136,25 +266,35 @@ def main():
     parser.add_argument("--models", nargs="+", help="List of models to test", default=["qwen2.5:1.5b"])
     parser.add_argument("--dataset", default="benchmarks/dataset.json", help="Path to dataset")
     parser.add_argument("--url", default="http://localhost:11434", help="Ollama base URL")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached analyses and always query the model")
+    parser.add_argument("--warmup", type=int, default=2, help="Number of warmup analysis probes per model")
+    parser.add_argument("--warmup-profile", action="store_true", help="Record per-probe warmup latencies and cold-start penalty")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent requests per model (match OLLAMA_NUM_PARALLEL)")
     
     args = parser.parse_args()
     
     try:
-        dataset = load_dataset(args.dataset)
+        dataset = prepare_dataset(load_dataset(args.dataset))
     except Exception as e:
         print(f"Failed to load dataset: {e}")
         return
 
+    # Start a fresh JSONL log for this run
+    open(RESULTS_JSONL_PATH, "w", encoding="utf-8").close()
+
     all_results = []
     for model in args.models:
-        all_results.append(evaluate_model(model, dataset, args.url))
+        result = evaluate_model(model, dataset, args.url, concurrency=args.concurrency, use_cache=not args.no_cache,
+                                warmup_probes=args.warmup, warmup_profile=args.warmup_profile)
+        append_result(result)
+        all_results.append(result)
         
     print_report(all_results)
 
     # Save full results
-    with open("benchmarks/results.json", "w", encoding="utf-8") as f:
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
         json.dump(all_results, f, indent=2)
-    print("\nFull results saved to benchmarks/results.json")
+    print(f"\nFull results saved to {RESULTS_PATH} (per-model lines in {RESULTS_JSONL_PATH})")
 
 if __name__ == "__main__":
     main()
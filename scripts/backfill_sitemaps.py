@@ -2,6 +2,7 @@ import argparse
 import logging
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -9,6 +10,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.aggregator.sitemap import SitemapBackfiller
 from src.pipeline import IngestionPipeline
 from src.settings import load_config
+from src.rate_limiter import RateLimiter
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("backfill_cli")
@@ -18,6 +20,11 @@ def main():
     parser.add_argument("month", help="Target month (YYYY-MM)")
     parser.add_argument("--limit", type=int, default=50, help="Max articles to process")
     parser.add_argument("--config", default="config.yaml", help="Path to config file")
+    parser.add_argument("--batch-size", type=int, default=16, help="Articles to analyze and store per batch")
+    parser.add_argument("--rate", type=float, default=4, help="Max scrape requests per second")
+    parser.add_argument("--burst", type=int, default=4, help="Scrape requests allowed back-to-back before rate limiting")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent scrape workers")
+    parser.add_argument("--parse-processes", action="store_true", help="Parse sitemaps in worker processes instead of threads")
     
     args = parser.parse_args()
     
@@ -30,7 +37,7 @@ def main():
     logger.info(f"Starting backfill for {args.month} (Limit: {args.limit})")
     
     # 1. Discover
-    backfiller = SitemapBackfiller()
+    backfiller = SitemapBackfiller(parse_processes=args.parse_processes)
     urls = backfiller.get_urls_for_month(year, month)
     
     if not urls:
@@ -44,39 +51,64 @@ def main():
     pipeline = IngestionPipeline(args.config)
     
     success = 0
-    for i, url in enumerate(urls):
+    pending = []
+
+    def flush():
+        nonlocal success
+        if not pending:
+            return
         try:
-            logger.info(f"[{i+1}/{len(urls)}] Processing {url}")
-            
-            # Scrape
-            meta_holder = {"is_slug_title": True}
-            content = pipeline.aggregator._scrape_article_content(url, metadata=meta_holder)
+            results = pipeline.process_articles_batch(pending)
+        except Exception as e:
+            logger.error(f"  -> Batch error: {e}")
+            results = []
+        for result in results:
+            if result["status"] == "imported":
+                success += 1
+                logger.info(f"  -> Imported: {result['title']}")
+            elif result["status"] == "error":
+                logger.error(f"  -> Failed: {result['title']} ({result.get('reason')})")
+            else:
+                logger.info(f"  -> Skipped: {result['title']} ({result.get('reason')})")
+        pending.clear()
+
+    limiter = RateLimiter(rate=args.rate, burst=args.burst)
+
+    def scrape(url):
+        meta_holder = {"is_slug_title": True}
+        try:
+            with limiter:
+                content = pipeline.aggregator._scrape_article_content(url, metadata=meta_holder)
+        except Exception as e:
+            logger.error(f"  -> Error scraping {url}: {e}")
+            content = ""
+        return content, meta_holder
+
+    # Scrapes run ahead in the pool while batches are analyzed here
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        for i, (url, (content, meta_holder)) in enumerate(zip(urls, executor.map(scrape, urls))):
+            logger.info(f"[{i+1}/{len(urls)}] Scraped {url}")
             
             if content:
                 title = meta_holder.get("title")
                 if not title or meta_holder.get("is_slug_title"):
                     title = url.split("/")[-1].replace("-", " ").title()
                 
-                article_data = {
+                pending.append({
                     "title": title,
                     "link": url,
                     "published": f"{args.month}-01",
                     "content": content,
                     "source": "BBC Archive",
                     "is_slug_title": False
-                }
-                
-                result = pipeline.process_article(article_data)
-                if result["status"] == "imported":
-                    success += 1
-                    logger.info(f"  -> Imported: {title}")
-                else:
-                    logger.info(f"  -> Skipped: {result.get('reason')}")
+                })
             else:
                 logger.warning("  -> Failed to scrape content")
-                
-        except Exception as e:
-            logger.error(f"  -> Error: {e}")
+
+            if len(pending) >= args.batch_size:
+                flush()
+
+    flush()
             
     logger.info(f"Backfill complete. Imported {success}/{len(urls)}.")
 
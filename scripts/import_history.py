@@ -2,18 +2,28 @@
 """
 Script to import historical news data from Hugging Face datasets.
 Usage: python scripts/import_history.py --dataset RealTimeData/bbc_news_alltime --config 2024-01 --limit 100
+
+For repeated imports, keep the pipeline and dataset handles resident:
+    python scripts/import_history.py --daemon &
+    python scripts/import_history.py --client --config 2024-02 --limit 100
 """
 
 import argparse
+import json
 import logging
 import os
+import socket
+import socketserver
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from datasets import load_dataset
+from datasets import Dataset, load_dataset
 from src.pipeline import IngestionPipeline
 
 # Configure logging
@@ -47,70 +57,148 @@ def map_guardian_article(item):
         "summary": item.get("trailText", "")
     }
 
-def main():
-    parser = argparse.ArgumentParser(description="Import history from Hugging Face")
-    parser.add_argument("--dataset", default="RealTimeData/bbc_news_alltime", help="Hugging Face dataset ID")
-    parser.add_argument("--config", default="2024-01", help="Dataset configuration/subset (e.g., YYYY-MM)")
-    parser.add_argument("--limit", type=int, default=50, help="Number of articles to import")
-    parser.add_argument("--dry-run", action="store_true", help="Process but do not store in DB")
-    args = parser.parse_args()
+def _column(batch, name, default, size):
+    """Return a batch column, or a column of defaults when the dataset lacks it."""
+    return batch[name] if name in batch else [default] * size
 
-    # Check for HF Token
-    if not os.environ.get("HF_TOKEN") and not os.environ.get("HUGGING_FACE_HUB_TOKEN"):
-        logger.warning("No HF_TOKEN found. Some datasets (like RealTimeData) may require authentication.")
-        logger.warning("Export HF_TOKEN=<your_token> before running if access is denied.")
+def _batch_size(batch):
+    return len(next(iter(batch.values()), []))
 
-    logger.info(f"Initializing pipeline...")
-    pipeline = IngestionPipeline()
+def map_bbc_batch(batch):
+    """Column-wise map_bbc_article for Dataset.map(batched=True)."""
+    n = _batch_size(batch)
+    now = datetime.now()
+    content = _column(batch, "content", "", n)
+    text = _column(batch, "text", "", n)
+    links = batch["url"] if "url" in batch else [
+        f"http://history/bbc/{now.timestamp()}-{i}" for i in range(n)
+    ]
+    return {
+        "title": _column(batch, "title", "No Title", n),
+        "link": links,
+        "content": [c or t for c, t in zip(content, text)],
+        "published": _column(batch, "date", now.isoformat(), n),
+        "source": ["BBC News Archive"] * n,
+        "summary": _column(batch, "description", "", n),
+    }
 
-    logger.info(f"Loading dataset: {args.dataset} ({args.config})...")
-    try:
+def map_guardian_batch(batch):
+    """Column-wise map_guardian_article for Dataset.map(batched=True)."""
+    n = _batch_size(batch)
+    now = datetime.now()
+    body = _column(batch, "bodyText", "", n)
+    text = _column(batch, "text", "", n)
+    return {
+        "title": _column(batch, "headline", "No Title", n),
+        "link": _column(batch, "webUrl", "", n),
+        "content": [b or t for b, t in zip(body, text)],
+        "published": _column(batch, "webPublicationDate", now.isoformat(), n),
+        "source": ["The Guardian Archive"] * n,
+        "summary": _column(batch, "trailText", "", n),
+    }
+
+def map_generic_batch(batch):
+    """Column-wise mapping for datasets without a dedicated mapper."""
+    n = _batch_size(batch)
+
+    def first(names, default):
+        for name in names:
+            if name in batch:
+                return batch[name]
+        return [default] * n
+
+    return {
+        "title": first(["title"], "Unknown"),
+        "link": first(["url", "link"], ""),
+        "content": first(["content", "text"], ""),
+        "published": [str(v) for v in first(["date", "published"], "")],
+        "source": ["HF Archive"] * n,
+    }
+
+def map_article(dataset_name, item):
+    """Map a single streamed row to pipeline format."""
+    name = dataset_name.lower()
+    if "bbc" in name:
+        return map_bbc_article(item)
+    if "guardian" in name:
+        return map_guardian_article(item)
+    # Generic fallback
+    return {
+        "title": item.get("title", "Unknown"),
+        "link": item.get("url", item.get("link", "")),
+        "content": item.get("content", item.get("text", "")),
+        "published": str(item.get("date", item.get("published", ""))),
+        "source": "HF Archive"
+    }
+
+def map_dataset(dataset_name, ds):
+    """Map a materialized dataset to pipeline format in Arrow batches across processes."""
+    name = dataset_name.lower()
+    if "bbc" in name:
+        fn = map_bbc_batch
+    elif "guardian" in name:
+        fn = map_guardian_batch
+    else:
+        fn = map_generic_batch
+    return ds.map(
+        fn,
+        batched=True,
+        batch_size=1000,
+        num_proc=max(1, (os.cpu_count() or 2) // 2),
+        remove_columns=ds.column_names,
+    )
+
+DEFAULT_SOCKET = "data/import_history.sock"
+
+# Columns each mapper reads; everything else stays on disk when loading parquet
+BBC_COLUMNS = ["title", "url", "content", "date", "description"]
+GUARDIAN_COLUMNS = ["headline", "webUrl", "bodyText", "webPublicationDate", "trailText"]
+
+# Above this many rows, a non-streaming (parquet) load beats row-by-row streaming
+STREAMING_LIMIT = 500
+
+def dataset_columns(dataset_name):
+    """Return the column projection for a dataset, or None to load every column."""
+    name = dataset_name.lower()
+    if "bbc" in name:
+        return BBC_COLUMNS
+    if "guardian" in name:
+        return GUARDIAN_COLUMNS
+    return None
+
+def load_history(dataset_name, config, limit):
+    """Load at most `limit` rows, streaming small imports and projecting columns on large ones."""
+    if limit <= STREAMING_LIMIT:
         # Use streaming to avoid downloading massive files
-        ds = load_dataset(args.dataset, args.config, split="train", streaming=True)
-    except Exception as e:
-        logger.error(f"Failed to load dataset: {e}")
-        return
+        ds = load_dataset(dataset_name, config, split="train", streaming=True)
+        return ds.take(limit)
+
+    split = f"train[:{limit}]"
+    columns = dataset_columns(dataset_name)
+    if columns:
+        try:
+            return load_dataset(dataset_name, config, split=split, columns=columns)
+        except ValueError as e:
+            logger.warning(f"Column selection failed ({e}); loading all columns")
+    return load_dataset(dataset_name, config, split=split)
+
+def import_history(pipeline, ds, dataset_name, limit, workers=8, dry_run=False):
+    """Feed up to `limit` dataset rows through the pipeline; returns import counters."""
+    if isinstance(ds, Dataset):
+        # Already pipeline-shaped rows; no per-row mapping needed below
+        rows = map_dataset(dataset_name, ds)
+    else:
+        rows = (map_article(dataset_name, item) for item in ds)
 
     count = 0
     imported = 0
     skipped = 0
     alerts = 0
 
-    logger.info(f"Starting import of {args.limit} articles...")
-    
-    for item in ds:
-        if count >= args.limit:
-            break
-            
-        count += 1
-        
-        # Determine mapper based on dataset name
-        article_data = {}
-        if "bbc" in args.dataset.lower():
-            article_data = map_bbc_article(item)
-        elif "guardian" in args.dataset.lower():
-            article_data = map_guardian_article(item)
-        else:
-            # Generic fallback
-            article_data = {
-                "title": item.get("title", "Unknown"),
-                "link": item.get("url", item.get("link", "")),
-                "content": item.get("content", item.get("text", "")),
-                "published": str(item.get("date", item.get("published", ""))),
-                "source": "HF Archive"
-            }
-
-        if not article_data["content"]:
-            logger.debug(f"Skipping item {count}: No content")
-            continue
-
-        logger.info(f"Processing [{count}/{args.limit}]: {article_data['title'][:50]}...")
-
-        if args.dry_run:
-            continue
-
+    def record(article_data, future):
+        nonlocal imported, skipped, alerts
         try:
-            result = pipeline.process_article(article_data)
+            result = future.result()
             
             if result["status"] == "imported":
                 imported += 1
@@ -124,13 +212,166 @@ def main():
         except Exception as e:
             logger.error(f"Error processing article: {e}")
 
+    logger.info(f"Starting import of {limit} articles...")
+
+    # LLM analysis and DB writes are I/O bound, so articles overlap in a thread
+    # pool. At most 2*workers are queued at once; results are tallied in order.
+    workers = max(1, workers)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for article_data in rows:
+            if count >= limit:
+                break
+                
+            count += 1
+
+            if not article_data["content"]:
+                logger.debug(f"Skipping item {count}: No content")
+                continue
+
+            logger.info(f"Processing [{count}/{limit}]: {article_data['title'][:50]}...")
+
+            if dry_run:
+                continue
+
+            pending.append((article_data, executor.submit(pipeline.process_article, article_data)))
+            while len(pending) >= 2 * workers:
+                record(*pending.popleft())
+
+        while pending:
+            record(*pending.popleft())
+
+    return {"processed": count, "imported": imported, "skipped": skipped, "alerts": alerts}
+
+def log_summary(stats):
     logger.info("="*40)
     logger.info(f"Import Complete")
-    logger.info(f"Total Processed: {count}")
-    logger.info(f"Imported:       {imported}")
-    logger.info(f"Skipped:        {skipped}")
-    logger.info(f"Alerts Found:   {alerts}")
+    logger.info(f"Total Processed: {stats['processed']}")
+    logger.info(f"Imported:       {stats['imported']}")
+    logger.info(f"Skipped:        {stats['skipped']}")
+    logger.info(f"Alerts Found:   {stats['alerts']}")
     logger.info("="*40)
 
+class ImportRequestHandler(socketserver.StreamRequestHandler):
+    """Handles one JSON import request per connection and replies with the counters."""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            dataset_name = request.get("dataset", "RealTimeData/bbc_news_alltime")
+            config = request.get("config", "2024-01")
+            limit = int(request.get("limit", 50))
+            ds = self.server.load(dataset_name, config, limit)
+            # One import at a time against the shared pipeline
+            with self.server.lock:
+                stats = import_history(
+                    self.server.pipeline, ds, dataset_name, limit,
+                    workers=int(request.get("workers", 8)),
+                    dry_run=bool(request.get("dry_run", False)),
+                )
+            log_summary(stats)
+            reply = {"status": "ok", **stats}
+        except Exception as e:
+            logger.error(f"Import request failed: {e}")
+            reply = {"status": "error", "error": str(e)}
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+class ImportDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Keeps the pipeline and loaded dataset handles resident between imports."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, pipeline):
+        self.pipeline = pipeline
+        self.lock = threading.Lock()
+        self._datasets = {}
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, ImportRequestHandler)
+
+    def load(self, dataset_name, config, limit):
+        key = (dataset_name, config, limit)
+        with self.lock:
+            if key not in self._datasets:
+                logger.info(f"Loading dataset: {dataset_name} ({config})...")
+                self._datasets[key] = load_history(dataset_name, config, limit)
+            return self._datasets[key]
+
+def run_daemon(socket_path):
+    logger.info(f"Initializing pipeline...")
+    pipeline = IngestionPipeline()
+    pipeline.llm_client.warmup()
+
+    os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+    with ImportDaemon(socket_path, pipeline) as server:
+        logger.info(f"Import daemon listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
+
+def send_request(socket_path, request):
+    """Send an import request to a running daemon and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
+
+def main():
+    parser = argparse.ArgumentParser(description="Import history from Hugging Face")
+    parser.add_argument("--dataset", default="RealTimeData/bbc_news_alltime", help="Hugging Face dataset ID")
+    parser.add_argument("--config", default="2024-01", help="Dataset configuration/subset (e.g., YYYY-MM)")
+    parser.add_argument("--limit", type=int, default=50, help="Number of articles to import")
+    parser.add_argument("--dry-run", action="store_true", help="Process but do not store in DB")
+    parser.add_argument("--workers", type=int, default=8, help="Articles processed concurrently")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--daemon", action="store_true", help="Serve import requests with the pipeline kept resident")
+    mode.add_argument("--client", action="store_true", help="Send this import to a running --daemon")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket used by --daemon/--client")
+    args = parser.parse_args()
+
+    if args.client:
+        try:
+            reply = send_request(args.socket, {
+                "dataset": args.dataset,
+                "config": args.config,
+                "limit": args.limit,
+                "workers": args.workers,
+                "dry_run": args.dry_run,
+            })
+        except OSError as e:
+            logger.error(f"Could not reach import daemon at {args.socket}: {e}")
+            sys.exit(1)
+        print(json.dumps(reply, indent=2))
+        return
+
+    # Check for HF Token
+    if not os.environ.get("HF_TOKEN") and not os.environ.get("HUGGING_FACE_HUB_TOKEN"):
+        logger.warning("No HF_TOKEN found. Some datasets (like RealTimeData) may require authentication.")
+        logger.warning("Export HF_TOKEN=<your_token> before running if access is denied.")
+
+    if args.daemon:
+        run_daemon(args.socket)
+        return
+
+    logger.info(f"Initializing pipeline...")
+    pipeline = IngestionPipeline()
+    # Load models up front so the first article doesn't absorb the cold start
+    if not args.dry_run:
+        pipeline.llm_client.warmup()
+
+    logger.info(f"Loading dataset: {args.dataset} ({args.config})...")
+    try:
+        ds = load_history(args.dataset, args.config, args.limit)
+    except Exception as e:
+        logger.error(f"Failed to load dataset: {e}")
+        return
+
+    stats = import_history(pipeline, ds, args.dataset, args.limit, workers=args.workers, dry_run=args.dry_run)
+    log_summary(stats)
+
 if __name__ == "__main__":
     main()
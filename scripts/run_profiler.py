@@ -42,7 +42,7 @@ def main():
         logger.error(f"❌ Required model '{model}' not available")
         sys.exit(1)
     
-    profiler = CompanyContextProfiler()
+    profiler = CompanyContextProfiler(config=cfg)
     
     try:
         contexts = profiler.refresh_all_contexts()
@@ -1,8 +1,15 @@
 import os
+import sys
 import requests
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.fileio import atomic_write
 
 # Configure logging
 logging.basicConfig(
@@ -14,6 +21,17 @@ logger = logging.getLogger("hf_sync")
 BASE_URL = "https://huggingface.co/datasets/RealTimeData/bbc_news_alltime/resolve/main"
 ARCHIVE_DIR = "data/archive"
 
+# One keep-alive pool for every month, shared by the download threads
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.5)),
+)
+_SESSION.headers.update({"User-Agent": "newsfinder-sync/1.0"})
+
+# Parquet files run to several MB; large chunks keep the per-chunk Python overhead negligible
+CHUNK_SIZE = 1024 * 1024
+
 def generate_month_list(start_date: str, end_date: str = None) -> list[str]:
     """Generate a list of YYYY-MM strings between start and end dates."""
     start = datetime.strptime(start_date, "%Y-%m")
@@ -22,16 +40,10 @@ def generate_month_list(start_date: str, end_date: str = None) -> list[str]:
     else:
         end = datetime.now()
     
-    dates = []
-    current = start
-    while current <= end:
-        dates.append(current.strftime("%Y-%m"))
-        # Move to next month
-        if current.month == 12:
-            current = current.replace(year=current.year + 1, month=1)
-        else:
-            current = current.replace(month=current.month + 1)
-    return dates
+    # Count months from year 0 so each step is a single divmod
+    first = start.year * 12 + start.month - 1
+    last = end.year * 12 + end.month - 1
+    return [f"{m // 12:04d}-{m % 12 + 1:02d}" for m in range(first, last + 1)]
 
 def download_month(month: str, force: bool = False):
     """Download the parquet file for a specific month."""
@@ -44,31 +56,36 @@ def download_month(month: str, force: bool = False):
         logger.info(f"Skipping {month}: already exists at {local_path}")
         return
 
-    logger.info(f"Checking {month} at {remote_url}...")
-    
+    logger.info(f"Downloading {month} from {remote_url}...")
     try:
-        # Check if exists (HEAD request)
-        head = requests.head(remote_url, allow_redirects=True, timeout=10)
-        if head.status_code != 200:
-            logger.warning(f"Month {month} not found (Status: {head.status_code})")
+        # No HEAD probe: a missing month shows up as a non-200 on the GET itself
+        response = _SESSION.get(remote_url, stream=True, timeout=60)
+        if response.status_code == 404:
+            logger.warning(f"Month {month} not found (Status: {response.status_code})")
+            response.close()
             return
+        response.raise_for_status()
 
-        # Download
-        logger.info(f"Downloading {month}...")
         os.makedirs(local_dir, exist_ok=True)
         
-        response = requests.get(remote_url, stream=True, timeout=60)
-        response.raise_for_status()
-        
         total_size = int(response.headers.get('content-length', 0))
         downloaded = 0
         
-        with open(local_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-        
+        # Renamed into place only on success, so an interrupted download never
+        # leaves a truncated data.parquet that later runs would skip
+        with atomic_write(local_path) as tmp_path:
+            with open(tmp_path, "wb", buffering=CHUNK_SIZE) as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+            # Content-Length counts encoded bytes, so only compare for identity transfers
+            if total_size and not response.headers.get("content-encoding") and downloaded != total_size:
+                raise IOError(f"incomplete download ({downloaded} of {total_size} bytes)")
+
         logger.info(f"Successfully saved to {local_path} ({downloaded/1024/1024:.2f} MB)")
         
     except Exception as e:
@@ -79,13 +96,15 @@ def main():
     parser.add_argument("--start", default="2023-01", help="Start month (YYYY-MM)")
     parser.add_argument("--end", help="End month (YYYY-MM), defaults to current month")
     parser.add_argument("--force", action="store_true", help="Overwrite existing files")
+    parser.add_argument("--workers", type=int, default=8, help="Months downloaded concurrently")
     args = parser.parse_args()
 
     months = generate_month_list(args.start, args.end)
     logger.info(f"Syncing {len(months)} months from {months[0]} to {months[-1]}")
     
-    for month in months:
-        download_month(month, args.force)
+    # Downloads are network bound, so overlap them rather than paying each month's latency in turn
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        list(executor.map(lambda month: download_month(month, args.force), months))
 
 if __name__ == "__main__":
     main()
@@ -5,16 +5,17 @@ Script to test prompt improvements on specific problematic articles.
 
 import sys
 import os
+import re
 import logging
 import argparse
-from datasets import load_dataset
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.analysis.llm_client import OllamaClient
 from src.settings import load_config
-from src.pipeline import IngestionPipeline
 
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
@@ -23,10 +24,69 @@ logger = logging.getLogger(__name__)
 DISTRACTOR_KEYWORDS = [
     "Football", "Cricket", "Tennis", "Celebrity", "Movie", "Star", "Album", "Concert"
 ]
+_DISTRACTOR_PATTERN = "|".join(map(re.escape, DISTRACTOR_KEYWORDS))
+# Titles that mention these may genuinely be relevant, so they don't make good distractors
+_HEALTH_PATTERN = r"Health|Hospital"
+_DISTRACTOR_RE = re.compile(_DISTRACTOR_PATTERN)
+_HEALTH_RE = re.compile(_HEALTH_PATTERN)
+
+# Local mirror written by scripts/sync_hf_archive.py
+ARCHIVE_PATH = "data/archive/{month}/data.parquet"
+MAX_DISTRACTORS = 5
+
+LLM_CACHE_DIR = "cache/llm"
+
+def find_local_distractors(path, limit=MAX_DISTRACTORS):
+    """Filter a whole month of synced parquet with Arrow kernels instead of iterating rows."""
+    names = pq.read_schema(path).names
+    if "title" not in names:
+        logger.warning(f"Skipping {path}: no title column")
+        return []
+    columns = [c for c in ("title", "content", "text") if c in names]
+    table = pq.read_table(path, columns=columns)
+    # Only pick if it doesn't explicitly mention "Health" or "Hospital" in title
+    mask = pc.and_(
+        pc.match_substring_regex(table["title"], _DISTRACTOR_PATTERN),
+        pc.invert(pc.match_substring_regex(table["title"], _HEALTH_PATTERN)),
+    )
+    rows = table.filter(pc.fill_null(mask, False)).slice(0, limit).to_pylist()
+    return [
+        {"title": row["title"], "content": row.get("content") or row.get("text") or ""}
+        for row in rows
+    ]
+
+def find_streamed_distractors(config, limit=MAX_DISTRACTORS, search_limit=500):
+    """Fallback when the month isn't synced locally: scan the start of the HF stream."""
+    from datasets import load_dataset
+
+    logger.info(f"Fetching content from Hugging Face (BBC News {config})...")
+    ds = load_dataset("RealTimeData/bbc_news_alltime", config, split="train", streaming=True)
+
+    logger.info("Scanning for 'Distractor' articles (Sports/Entertainment)...")
+    
+    test_articles = []
+    count = 0
+    
+    for item in ds:
+        count += 1
+        if count > search_limit:
+            break
+            
+        title = item.get("title", "")
+        content = item.get("content", "") or item.get("text", "")
+        
+        # Check if this is a good distractor
+        # Only pick if it doesn't explicitly mention "Health" or "Hospital" in title
+        if _DISTRACTOR_RE.search(title) and not _HEALTH_RE.search(title):
+            test_articles.append({"title": title, "content": content})
+            if len(test_articles) >= limit:
+                break
+    return test_articles
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--config", default="2026-01", help="Dataset config (YYYY-MM)")
+    parser.add_argument("--no-cache", action="store_true", help="Always query the LLM instead of reusing cached analyses")
     args = parser.parse_args()
 
     config = load_config("config.yaml")
@@ -35,53 +95,40 @@ def main():
     llm = OllamaClient(
         base_url=config["llm"]["base_url"],
         model=config["llm"]["model"],
-        embedding_model=config["llm"]["embedding_model"]
+        embedding_model=config["llm"]["embedding_model"],
+        # Re-runs while tuning prompts only pay for articles/prompts that changed
+        cache_dir=None if args.no_cache else LLM_CACHE_DIR,
     )
     
-    # Load company context
-    pipeline = IngestionPipeline()
+    # Load company context (deferred import: the pipeline pulls in ChromaDB)
+    from src.pipeline import IngestionPipeline
+    pipeline = IngestionPipeline(config=config)
     context = pipeline._load_company_context()
 
-    logger.info(f"Fetching content from Hugging Face (BBC News {args.config})...")
+    archive_path = ARCHIVE_PATH.format(month=args.config)
     try:
-        ds = load_dataset("RealTimeData/bbc_news_alltime", args.config, split="train", streaming=True)
+        if os.path.exists(archive_path):
+            logger.info(f"Scanning local archive {archive_path} for 'Distractor' articles (Sports/Entertainment)...")
+            test_articles = find_local_distractors(archive_path)
+        else:
+            test_articles = find_streamed_distractors(args.config)
     except Exception as e:
         logger.error(f"Failed to load dataset: {e}")
         return
-
-    logger.info("Scanning for 'Distractor' articles (Sports/Entertainment)...")
-    
-    test_articles = []
-    count = 0
-    search_limit = 500
-    
-    for item in ds:
-        count += 1
-        if count > search_limit:
-            break
-            
-        title = item.get("title", "")
-        content = item.get("content", "") or item.get("text", "")
-        
-        # Check if this is a good distractor
-        if any(k in title for k in DISTRACTOR_KEYWORDS):
-            # Only pick if it doesn't explicitly mention "Health" or "Hospital" in title
-            if "Health" not in title and "Hospital" not in title:
-                test_articles.append({"title": title, "content": content})
-                if len(test_articles) >= 5:
-                    break
     
     logger.info(f"Found {len(test_articles)} distractor articles.")
     logger.info("-" * 60)
 
     passed = 0
     
-    for article in test_articles:
+    # Send every article to the LLM up front; results are reported in order below
+    analyses = llm.analyze_articles_batch([article["content"] for article in test_articles], context)
+
+    for article, analysis in zip(test_articles, analyses):
         title = article["title"]
         logger.info(f"Analyzing: {title}")
         logger.info("  Expected Score: Low (0-3)")
         
-        analysis = llm.analyze_article(article["content"], context)
         score = analysis.get("relevance_score", 0)
         reasoning = analysis.get("relevance_reasoning", "")
         
@@ -4,7 +4,9 @@
 from __future__ import annotations
 
 import argparse
+import json
 import os
+import select
 import signal
 import subprocess
 import sys
@@ -15,21 +17,46 @@ from typing import Optional
 import yaml
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT_DIR))
+from src.fileio import atomic_write
+from src.settings import YAML_LOADER
+
 LOG_DIR = ROOT_DIR / "logs"
 PID_FILE = LOG_DIR / "ui.pid"
 LOG_FILE = LOG_DIR / "ui.log"
+META_FILE = LOG_DIR / "ui.meta.json"
 
 
 def load_web_config() -> tuple[str, int]:
     config_path = ROOT_DIR / "config.yaml"
     host = "0.0.0.0"
     port = 5000
-    if config_path.exists():
-        with config_path.open("r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle) or {}
-            web_cfg = data.get("web", {})
-            host = web_cfg.get("host", host)
-            port = int(web_cfg.get("port", port))
+    if not config_path.exists():
+        return host, port
+
+    # Reuse the host/port from the last start unless config.yaml changed since
+    mtime_ns = config_path.stat().st_mtime_ns
+    try:
+        meta = json.loads(META_FILE.read_text(encoding="utf-8"))
+        if meta.get("config_mtime_ns") == mtime_ns:
+            return meta["host"], int(meta["port"])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    with config_path.open("r", encoding="utf-8") as handle:
+        data = yaml.load(handle, Loader=YAML_LOADER) or {}
+        web_cfg = data.get("web", {})
+        host = web_cfg.get("host", host)
+        port = int(web_cfg.get("port", port))
+
+    try:
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        with atomic_write(str(META_FILE)) as tmp_path:
+            Path(tmp_path).write_text(
+                json.dumps({"config_mtime_ns": mtime_ns, "host": host, "port": port}), encoding="utf-8"
+            )
+    except OSError:
+        pass
     return host, port
 
 
@@ -50,6 +77,33 @@ def is_running(pid: int) -> bool:
         return False
 
 
+def wait_for_exit(pid: int, timeout: float) -> bool:
+    """Wait up to `timeout` seconds for pid to exit; returns True once it has."""
+    # The UI isn't our child (an earlier invocation started it), so waitpid
+    # can't be used; a pidfd lets the kernel wake us on exit instead.
+    if hasattr(os, "pidfd_open"):
+        try:
+            fd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            fd = None
+        if fd is not None:
+            try:
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
+                return bool(poller.poll(int(timeout * 1000)))
+            finally:
+                os.close(fd)
+
+    deadline = time.monotonic() + timeout
+    while is_running(pid):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
 def start() -> None:
     pid = read_pid()
     if pid and is_running(pid):
@@ -72,8 +126,11 @@ def start() -> None:
         str(port),
     ]
 
+    # Leave the child's stdout block-buffered rather than forcing PYTHONUNBUFFERED:
+    # Python keeps stderr (where Flask logs and tracebacks go) line-buffered,
+    # so errors still reach the log promptly without a write() per print.
     env = os.environ.copy()
-    env["PYTHONUNBUFFERED"] = "1"
+    env.pop("PYTHONUNBUFFERED", None)
 
     with LOG_FILE.open("a", encoding="utf-8") as log_handle:
         process = subprocess.Popen(
@@ -82,7 +139,7 @@ def start() -> None:
             stdout=log_handle,
             stderr=log_handle,
             env=env,
-            preexec_fn=os.setsid,
+            start_new_session=True,
         )
 
     PID_FILE.write_text(str(process.pid))
@@ -101,12 +158,7 @@ def stop() -> None:
         return
 
     os.killpg(pid, signal.SIGTERM)
-    for _ in range(20):
-        if not is_running(pid):
-            break
-        time.sleep(0.2)
-
-    if is_running(pid):
+    if not wait_for_exit(pid, timeout=4.0):
         os.killpg(pid, signal.SIGKILL)
 
     PID_FILE.unlink(missing_ok=True)
@@ -6,8 +6,13 @@ Usage: python scripts/verify_missing.py
 
 import sys
 import os
+import argparse
+import json
 import logging
-import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,12 +20,65 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.database.chroma_client import NewsDatabase
 from src.analysis.verification_service import VerificationService
 from src.settings import load_config
+from src.rate_limiter import RateLimiter
+from src.bloom import BloomFilter
+from src.document_cache import DocumentCache
 from src.pipeline import IngestionPipeline # To get context loading logic
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Above this many verification records, track verified URLs in a Bloom filter
+# (a few bytes each) instead of a set of full URL strings. A false positive
+# just skips an article until a later run, which is harmless here.
+BLOOM_THRESHOLD = 200_000
+
+def load_verified_urls(log_file: str):
+    """Return a set (or, for large logs, a BloomFilter) of already-verified URLs."""
+    if not os.path.exists(log_file):
+        return set()
+
+    # Size the structure up front so a large log never materialises as a set
+    with open(log_file, "rb") as f:
+        records = sum(1 for _ in f)
+    verified = BloomFilter(records) if records > BLOOM_THRESHOLD else set()
+
+    with open(log_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                url = json.loads(line).get("article_url") if line.strip() else None
+            except json.JSONDecodeError:
+                continue
+            if url:
+                verified.add(url)
+    return verified
+
+# Fields read from each DB article. NewsDatabase fills url (from link) and
+# defaults for missing fields as rows are read, so they can be indexed directly
+_article_fields = itemgetter(
+    "url", "title", "summary_text", "relevance_score", "relevance_reasoning", "impact_score"
+)
+
+@lru_cache(maxsize=1)
+def load_company_context(path: str) -> str:
+    """Read the cached company context once per process."""
+    if not os.path.exists(path):
+        logger.warning("Context file not found, verification accuracy might suffer.")
+        return ""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+@lru_cache(maxsize=None)
+def url_hash(url: str) -> str:
+    """Document-cache key for a URL (same as DocumentCache.key_for)."""
+    return DocumentCache.key_for(url)
+
 def main():
+    parser = argparse.ArgumentParser(description="Backfill verifications for unverified articles")
+    parser.add_argument("--workers", type=int, default=8, help="Verification requests in flight at once")
+    parser.add_argument("--rate", type=float, default=2.0, help="Max verification requests per second (0 = unlimited)")
+    args = parser.parse_args()
+
     config = load_config("config.yaml")
     
     # Ensure verification is enabled and set to 100% in loaded config (it should be from previous edit)
@@ -31,44 +89,38 @@ def main():
     logger.info("Initializing services...")
     db = NewsDatabase(persist_directory=config["storage"]["chroma_dir"])
     service = VerificationService(config)
+    # Full article text scraped by RSSNewsAggregator
+    document_cache = DocumentCache("document-cache")
     
     # Need context for verification
-    context_file = config["storage"]["context_cache"]
-    if os.path.exists(context_file):
-        with open(context_file, "r", encoding="utf-8") as f:
-            company_context = f.read()
+    company_context = load_company_context(config["storage"]["context_cache"])
+
+    # Get existing verifications to skip
+    verified_urls = load_verified_urls(service.log_file)
+    if isinstance(verified_urls, BloomFilter):
+        logger.info("Loaded existing verification records into a Bloom filter.")
     else:
-        logger.warning("Context file not found, verification accuracy might suffer.")
-        company_context = ""
+        logger.info(f"Found {len(verified_urls)} existing verification records.")
 
-    # Get all articles
-    logger.info("Fetching articles from database...")
-    articles = db.get_all_articles(limit=5000)
-    logger.info(f"Found {len(articles)} articles in DB.")
+    # Page through the collection, only pulling documents for articles that still need verifying
+    logger.info("Streaming unverified articles from database...")
 
-    # Get existing verifications to skip
-    recent_verifications = service.get_recent_verifications(limit=5000)
-    verified_urls = set(v.get("article_url") for v in recent_verifications)
-    logger.info(f"Found {len(verified_urls)} existing verification records.")
+    def iter_jobs():
+        for article in db.iter_all_articles(exclude_urls=verified_urls):
+            job = build_job(article)
+            if job:
+                yield job
 
-    count = 0
-    errors = 0
-    
-    for i, article in enumerate(articles):
-        url = article.get("url") or article.get("link")
-        if not url:
-            continue
+    def build_job(article):
+        url, title, summary_text, relevance_score, relevance_reasoning, impact_score = _article_fields(article)
+        if not url or url in verified_urls:
+            return None
             
-        if url in verified_urls:
-            continue
-            
-        logger.info(f"Verifying [{i+1}/{len(articles)}]: {article.get('title', 'Unknown')}")
-        
         # Reconstruct article dict for service
         article_data = {
-            "title": article.get("title"),
+            "title": title,
             "link": url,
-            "content": article.get("summary_text", "") # We might not have full content if not cached? 
+            "content": summary_text # We might not have full content if not cached? 
             # actually DB stores summary_text as document. 
             # Ideally we want full content.
             # Let's check cache if available.
@@ -85,50 +137,71 @@ def main():
         # We should try to read from there.
         
         # Quick and dirty cache lookup
-        import hashlib
-        url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
-        cache_path = os.path.join("document-cache", f"{url_hash}.json")
-        
-        if os.path.exists(cache_path):
-            try:
-                import json
-                with open(cache_path, "r") as f:
-                    cached_data = json.load(f)
-                    article_data["content"] = cached_data.get("content", "")
-            except Exception:
-                pass
+        try:
+            cached_data = document_cache.get_by_key(url_hash(url))
+            if cached_data:
+                article_data["content"] = cached_data.get("content", "")
+        except Exception:
+            pass
         
         if not article_data.get("content"):
             # Fallback to summary from DB
-            article_data["content"] = article.get("summary_text", "")
+            article_data["content"] = summary_text
 
         # Prepare local result format
         local_result = {
-            "relevance_score": article.get("relevance_score", 0),
-            "relevance_reasoning": article.get("relevance_reasoning", ""),
-            "impact_score": article.get("impact_score", 0)
+            "relevance_score": relevance_score,
+            "relevance_reasoning": relevance_reasoning,
+            "impact_score": impact_score
         }
         
+        return article_data, local_result
+
+    # Force verification by setting sampling rates to 1.1 temporarily for this call?
+    # Actually we updated config on disk, so `service` initialized with 1.0. 
+    # But `should_verify` uses random < rate. 1.0 is inclusive? usually random() is [0.0, 1.0).
+    # So 1.0 is safe.
+
+    # Verification is a remote call, so keep several in flight; the shared
+    # limiter replaces the old fixed sleep between requests
+    limiter = RateLimiter(rate=args.rate)
+
+    def verify(job):
+        article_data, local_result = job
+        with limiter:
+            return service.verify(article_data, local_result, company_context)
+
+    count = 0
+    errors = 0
+    done = 0
+
+    def record(article_data, future):
+        nonlocal count, errors, done
+        done += 1
+        title = article_data.get("title") or "Unknown"
         try:
-            # Force verification by setting sampling rates to 1.1 temporarily for this call?
-            # Actually we updated config on disk, so `service` initialized with 1.0. 
-            # But `should_verify` uses random < rate. 1.0 is inclusive? usually random() is [0.0, 1.0).
-            # So 1.0 is safe.
-            
-            result = service.verify(article_data, local_result, company_context)
+            result = future.result()
             if result:
                 count += 1
-                logger.info(f"Verified. Remote Score: {result.get('remote_score')}")
+                logger.info(f"Verified [{done}]: {title}. Remote Score: {result.get('remote_score')}")
             else:
-                logger.info("Skipped (sampling or error).")
-                
-            # Sleep briefly to avoid rate limits if running fast
-            time.sleep(0.5)
-            
+                logger.info(f"Skipped [{done}] (sampling or error): {title}")
         except Exception as e:
-            logger.error(f"Failed to verify: {e}")
+            logger.error(f"Failed to verify {title}: {e}")
             errors += 1
 
+    # At most 2*workers jobs are queued, so memory stays flat however large the DB is
+    workers = max(1, args.workers)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for job in iter_jobs():
+            pending.append((job[0], executor.submit(verify, job)))
+            while len(pending) >= 2 * workers:
+                record(*pending.popleft())
+
+        while pending:
+            record(*pending.popleft())
+
     logger.info(f"Backfill complete. Verified {count} articles. Errors: {errors}")
 
 if __name__ == "__main__":
@@ -1,9 +1,18 @@
 from src.aggregator.sitemap import SitemapBackfiller
+import argparse
 import logging
 
 logging.basicConfig(level=logging.INFO)
 
-print("Pre-building sitemap directory...")
-bf = SitemapBackfiller()
-bf.build_directory()
-print("Done.")
+# Guarded so sitemap parse worker processes (--parse-processes) can re-import this module safely
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-build the BBC sitemap directory cache")
+    parser.add_argument("--concurrency", type=int, default=16, help="Sub-sitemaps downloaded at once")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if a cached directory exists")
+    parser.add_argument("--parse-processes", action="store_true", help="Parse sitemaps in worker processes instead of threads")
+    args = parser.parse_args()
+
+    print("Pre-building sitemap directory...")
+    bf = SitemapBackfiller(max_workers=args.concurrency, parse_processes=args.parse_processes)
+    bf.build_directory(force=args.force)
+    print("Done.")
@@ -1,32 +1,154 @@
 import requests
 import re
+import io
 import logging
+import multiprocessing
 import json
 import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
-from bs4 import BeautifulSoup
+from typing import Iterator, List, Dict, Optional, Tuple
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Shared keep-alive pool: every sitemap lives on the same host, so reusing
+# connections saves a TLS handshake per fetch. Sized above the fetch workers.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.5)),
+)
+
+# /YYYY/MM/ fragment some archive URLs carry in their path
+_PATH_DATE_RE = re.compile(r"/(\d{4})/(\d{2})/")
+
+def _iter_entries(content, tag: str) -> Iterator[Dict[str, str]]:
+    """
+    Stream <tag> elements (e.g. "url" or "sitemap") out of a sitemap document
+    (bytes or a binary file object), yielding {child_local_name: text}.
+    Elements are freed as we go so memory stays flat regardless of sitemap size.
+    """
+    source = io.BytesIO(content) if isinstance(content, bytes) else content
+    for _, elem in etree.iterparse(source, events=("end",), tag=f"{{*}}{tag}"):
+        # One pass over the children; callers then read loc/lastmod from the dict
+        # instead of searching the element again. Tags are "{ns}name" strings,
+        # so slicing off the namespace avoids building a QName per child.
+        entry = {}
+        for child in elem:
+            child_tag = child.tag
+            if isinstance(child_tag, str) and child.text:
+                entry[child_tag.rpartition("}")[2]] = child.text.strip()
+        yield entry
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+# The two functions below may run in worker processes (parse_processes=True),
+# so they take and return only cheap picklable values (bytes in; strings,
+# dicts and ints out).
+
+def _summarize_sitemap(content: bytes) -> Tuple[Optional[Dict[str, str]], Optional[Dict[str, str]], int]:
+    """Return the first entry, last entry and entry count of a sitemap."""
+    first = last = None
+    count = 0
+    try:
+        for entry in _iter_entries(content, "url"):
+            if first is None:
+                first = entry
+            last = entry
+            count += 1
+    except etree.XMLSyntaxError as e:
+        # lxml exceptions don't survive pickling reliably
+        raise ValueError(str(e)) from None
+    return first, last, count
+
+
+def _parse_month_urls(content: bytes, target_prefix: str) -> List[str]:
+    """
+    Return article URLs dated in target_prefix (YYYY-MM). The date comes from
+    <lastmod>, or from a /YYYY/MM/ path fragment when the entry has none.
+    """
+    found = []
+    try:
+        for entry in _iter_entries(content, "url"):
+            loc = entry.get("loc")
+            if not loc:
+                continue
+            lastmod = entry.get("lastmod")
+            if lastmod:
+                if lastmod.startswith(target_prefix):
+                    found.append(loc)
+                continue
+            match = _PATH_DATE_RE.search(loc)
+            if match and f"{match.group(1)}-{match.group(2)}" == target_prefix:
+                found.append(loc)
+    except etree.XMLSyntaxError as e:
+        raise ValueError(str(e)) from None
+    return found
+
+
 class SitemapBackfiller:
-    def __init__(self, cache_dir: str = "data"):
+    def __init__(
+        self,
+        cache_dir: str = "data",
+        max_workers: int = 8,
+        parse_workers: Optional[int] = None,
+        parse_processes: bool = False,
+    ):
         self.index_url = "https://www.bbc.co.uk/sitemaps/https-index-uk-archive.xml"
         self.cache_dir = cache_dir
+        # Sub-sitemap downloads are I/O bound; cap in-flight requests to stay polite
+        self.max_workers = max_workers
+        # Parsing runs on a thread pool by default. The per-element iterparse loop
+        # holds the GIL, so threads only overlap parsing with the downloads;
+        # parse_processes is what actually parses sitemaps in parallel
+        self.parse_workers = parse_workers if parse_workers is not None else (os.cpu_count() or 1)
+        # Worker processes are opt-in for CLI scripts only: forking from a caller
+        # that already runs threads (the web app, backfill pools) isn't safe
+        self.parse_processes = parse_processes
         self.index_cache_file = os.path.join(cache_dir, "sitemap_directory.json")
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
 
-    def _fetch_xml(self, url: str) -> Optional[BeautifulSoup]:
+    def _fetch_xml(self, url: str) -> Optional[bytes]:
         try:
-            response = requests.get(url, headers=self.headers, timeout=20)
+            response = _SESSION.get(url, headers=self.headers, timeout=20)
             response.raise_for_status()
-            return BeautifulSoup(response.content, "xml")
+            return response.content
         except Exception as e:
             logger.error(f"Failed to fetch XML from {url}: {e}")
             return None
 
+    def _stream_entries(self, url: str, tag: str) -> List[Dict[str, str]]:
+        """Parse a sitemap while it downloads, without holding the whole body."""
+        try:
+            with _SESSION.get(url, headers=self.headers, timeout=20, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                return list(_iter_entries(response.raw, tag))
+        except Exception as e:
+            logger.error(f"Failed to fetch or parse sitemap {url}: {e}")
+            return []
+
+    def _parse_executor(self, jobs: int) -> Executor:
+        """Thread pool for sitemap parsing, or a process pool when parse_processes is set."""
+        workers = max(1, min(self.parse_workers, jobs))
+        if self.parse_processes and workers > 1:
+            # Spawned, not forked: the download threads are already running
+            return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return ThreadPoolExecutor(max_workers=workers)
+
+    def _fetch_many(self, urls: List[str]):
+        """Fetch sitemaps concurrently, yielding raw XML in input order."""
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            yield from executor.map(self._fetch_xml, urls)
+
     def build_directory(self, force: bool = False) -> List[Dict]:
         """
         Scans the main archive index and determines the date range for each sub-sitemap.
@@ -40,54 +162,66 @@ class SitemapBackfiller:
                 pass
 
         logger.info("Building sitemap directory (this may take a while)...")
-        soup = self._fetch_xml(self.index_url)
-        if not soup:
+        # The index is parsed in-process, so stream it straight off the socket
+        locs = [e["loc"] for e in self._stream_entries(self.index_url, "sitemap") if e.get("loc")]
+        if not locs:
             return []
-
-        sitemaps = soup.find_all("sitemap")
         directory = []
 
-        for sm in sitemaps:
-            loc = sm.find("loc").text
-            logger.info(f"Inspecting sitemap: {loc}")
-            
-            sub_soup = self._fetch_xml(loc)
-            if not sub_soup:
-                continue
-
-            urls = sub_soup.find_all("url")
-            if not urls:
-                continue
+        def collect(loc: str, future) -> None:
+            try:
+                # Only the first and last entries matter for the date range
+                first, last, count = future.result()
+            except Exception as e:
+                logger.error(f"Failed to parse sitemap {loc}: {e}")
+                return
+            if not count:
+                return
 
             # Find dates in first and last entries
-            start_date = self._extract_date(urls[0])
-            end_date = self._extract_date(urls[-1])
+            start_date = self._extract_date(first)
+            end_date = self._extract_date(last)
 
             if start_date and end_date:
                 entry = {
                     "url": loc,
                     "start": start_date,
                     "end": end_date,
-                    "count": len(urls)
+                    "count": count
                 }
                 directory.append(entry)
                 # Save progress incrementally
                 self._save_directory(directory)
 
+        # Hand each download to the parse pool as soon as it arrives, and record
+        # finished parses (in order) while later downloads are still running
+        with self._parse_executor(len(locs)) as pool:
+            pending = deque()
+            for loc, sub_xml in zip(locs, self._fetch_many(locs)):
+                logger.info(f"Inspecting sitemap: {loc}")
+                if sub_xml:
+                    pending.append((loc, pool.submit(_summarize_sitemap, sub_xml)))
+                while pending and pending[0][1].done():
+                    collect(*pending.popleft())
+
+            while pending:
+                collect(*pending.popleft())
+
         return directory
 
-    def _extract_date(self, url_tag) -> Optional[str]:
+    def _extract_date(self, entry: Dict[str, str]) -> Optional[str]:
         # Try lastmod first
-        lastmod = url_tag.find("lastmod")
+        lastmod = entry.get("lastmod")
         if lastmod:
-            return lastmod.text[:10]  # YYYY-MM-DD
+            return lastmod[:10]  # YYYY-MM-DD
         
         # Fallback to URL regex
-        loc = url_tag.find("loc").text
-        match = re.search(r'/(\d{4})/(\d{2})/', loc) # /YYYY/MM/ pattern?
         # BBC URLs often don't have dates in path for older content, but let's try
         # Actually BBC URLs vary a lot. 
         # But looking at explore_sitemap output, lastmod seems reliable for the archive sitemaps.
+        match = _PATH_DATE_RE.search(entry.get("loc", ""))
+        if match:
+            return f"{match.group(1)}-{match.group(2)}-01"
         return None
 
     def _save_directory(self, directory: List[Dict]):
@@ -123,16 +257,17 @@ class SitemapBackfiller:
         logger.info(f"Found {len(relevant_sitemaps)} relevant sitemaps for {target_prefix}")
         
         found_urls = []
-        for sm_url in relevant_sitemaps:
-            logger.info(f"Scanning {sm_url}...")
-            soup = self._fetch_xml(sm_url)
-            if not soup:
-                continue
-                
-            for url_tag in soup.find_all("url"):
-                lastmod = url_tag.find("lastmod")
-                if lastmod and lastmod.text.startswith(target_prefix):
-                    loc = url_tag.find("loc").text
-                    found_urls.append(loc)
+        with self._parse_executor(len(relevant_sitemaps)) as pool:
+            pending = []
+            for sm_url, sm_xml in zip(relevant_sitemaps, self._fetch_many(relevant_sitemaps)):
+                logger.info(f"Scanning {sm_url}...")
+                if sm_xml:
+                    pending.append((sm_url, pool.submit(_parse_month_urls, sm_xml, target_prefix)))
+
+            for sm_url, future in pending:
+                try:
+                    found_urls.extend(future.result())
+                except Exception as e:
+                    logger.error(f"Failed to parse sitemap {sm_url}: {e}")
         
         return found_urls
@@ -13,6 +13,7 @@ and disables tools/MCP, making responses faster and more predictable.
 import json
 import logging
 import re
+import shutil
 import subprocess
 from typing import Any, Dict, List, Optional
 
@@ -20,6 +21,10 @@ logger = logging.getLogger(__name__)
 
 # ANSI escape sequence pattern
 _ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+# Leading "> " prompt marker kiro prints before a response
+_PROMPT_MARKER_RE = re.compile(r"^>\s*")
+# JSON object inside a markdown code block
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*\n?({.*?})\s*\n?```", re.DOTALL)
 
 
 class KiroCLIClient:
@@ -45,16 +50,36 @@ class KiroCLIClient:
         self.model = model
         self.timeout = timeout
         self.cwd = cwd
+        # A long-lived chat process can't be used (see module docstring), so
+        # keep the per-prompt spawn as cheap as possible: resolve the binary
+        # once and build the argument list once
+        self._executable = shutil.which("kiro-cli") or "kiro-cli"
+        self._cmd = self._build_command()
+        self._available = False
+
+    def _build_command(self) -> List[str]:
+        cmd = [self._executable, "chat", "--no-interactive", "--wrap=never"]
+        if self.agent:
+            cmd.extend(["--agent", self.agent])
+        if self.effort:
+            cmd.extend(["--effort", self.effort])
+        if self.model:
+            cmd.extend(["--model", self.model])
+        return cmd
 
     def check_connection(self) -> bool:
         """Check if kiro-cli is available."""
+        # Only a success is remembered, so an install mid-run is still noticed
+        if self._available:
+            return True
         try:
             result = subprocess.run(
-                ["kiro-cli", "--version"], capture_output=True, timeout=5
+                [self._executable, "--version"], capture_output=True, timeout=5
             )
-            return result.returncode == 0
+            self._available = result.returncode == 0
         except Exception:
-            return False
+            self._available = False
+        return self._available
 
     def prompt(self, message: str, timeout: Optional[int] = None) -> str:
         """
@@ -67,20 +92,12 @@ class KiroCLIClient:
         Returns:
             Clean text response (ANSI stripped).
         """
-        cmd = ["kiro-cli", "chat", "--no-interactive", "--wrap=never"]
-        if self.agent:
-            cmd.extend(["--agent", self.agent])
-        if self.effort:
-            cmd.extend(["--effort", self.effort])
-        if self.model:
-            cmd.extend(["--model", self.model])
-
         effective_timeout = timeout or self.timeout
 
         try:
             logger.info("⏳ Calling kiro-cli (timeout=%ds)...", effective_timeout)
             result = subprocess.run(
-                cmd,
+                self._cmd,
                 input=message,
                 capture_output=True,
                 text=True,
@@ -95,7 +112,7 @@ class KiroCLIClient:
             # Strip ANSI codes and the "> " prefix kiro adds
             clean = _ANSI_RE.sub("", result.stdout)
             # Remove leading "> " prompt marker if present
-            clean = re.sub(r"^>\s*", "", clean, count=1)
+            clean = _PROMPT_MARKER_RE.sub("", clean, count=1)
             clean = clean.strip()
 
             logger.info("✓ Response received (%d chars)", len(clean))
@@ -137,7 +154,7 @@ class KiroCLIClient:
                 pass
 
         # Try inside markdown code blocks
-        block_match = re.search(r"```(?:json)?\s*\n?({.*?})\s*\n?```", text, re.DOTALL)
+        block_match = _JSON_BLOCK_RE.search(text)
         if block_match:
             try:
                 return json.loads(block_match.group(1))
@@ -145,20 +162,44 @@ class KiroCLIClient:
                 pass
 
         # Find first { ... } block (handles nested objects)
-        depth = 0
-        start = None
-        for i, ch in enumerate(text):
-            if ch == "{":
-                if depth == 0:
-                    start = i
-                depth += 1
-            elif ch == "}":
-                depth -= 1
-                if depth == 0 and start is not None:
-                    try:
-                        return json.loads(text[start : i + 1])
-                    except json.JSONDecodeError:
-                        start = None
+        start = text.find("{")
+        while start != -1:
+            end = _find_json_end(text, start)
+            if end is None:
+                break
+            try:
+                return json.loads(text[start:end])
+            except json.JSONDecodeError:
+                start = text.find("{", start + 1)
 
         logger.error("No valid JSON found in response (%d chars)", len(text))
         return {}
+
+
+def _find_json_end(text: str, start: int) -> Optional[int]:
+    """
+    Index just past the "}" that closes the "{" at text[start], or None if it
+    never closes. A single pass tracking depth; braces inside string literals
+    (including escaped quotes) don't count.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
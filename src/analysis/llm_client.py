@@ -2,14 +2,133 @@
 Unified LLM client supporting Ollama (local HTTP) and Kiro ACP (persistent subprocess).
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import hashlib
 import logging
-from typing import List, Dict, Any
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import json
 
+import yaml
+
 from .acp_client import KiroCLIClient
+from src.fileio import JSON_ENCODER, atomic_write
+from src.settings import YAML_LOADER
 
 logger = logging.getLogger(__name__)
 
+# Used when prompts.yaml is missing or has no analysis_prompt
+FALLBACK_ANALYSIS_PROMPT = (
+    "You are a business intelligence analyst.\n"
+    "SECTION 1: STRATEGIC CONTEXT: {context}\n"
+    "TASK: Return JSON with summary, relevance_score (1-10), "
+    "relevance_reasoning, impact_score (1-10), key_entities "
+    "for the article in SECTION 2.\n"
+    "SECTION 2: ARTICLE TEXT: {clipped_text}"
+)
+
+PROMPTS_PATH = "prompts.yaml"
+
+# path -> ((mtime_ns, size), analysis_prompt)
+_PROMPT_CACHE: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def load_prompt_template(path: str = PROMPTS_PATH) -> str:
+    """The analysis_prompt from prompts.yaml, re-parsed only when the file changes."""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _PROMPT_CACHE.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    with open(path, "r") as f:
+        data = yaml.load(f, Loader=YAML_LOADER) or {}
+    template = data.get("analysis_prompt", "") or ""
+    _PROMPT_CACHE[path] = (stamp, template)
+    return template
+
+
+# Article budget for analysis prompts, in characters (~1k tokens of English)
+ARTICLE_CHAR_LIMIT = 4000
+
+# Sent with every generate request: keep the model resident between articles
+# and size its context for the analysis prompt. The options must match across
+# calls, since Ollama reloads the model when num_ctx changes. Prompts put their
+# fixed instructions first and the article last, so consecutive calls share a
+# byte-identical prefix that Ollama serves from its prompt cache.
+OLLAMA_KEEP_ALIVE = "30m"
+OLLAMA_OPTIONS = {"num_ctx": 4096}
+
+# Seconds allowed to establish a connection. Requests pass (CONNECT_TIMEOUT,
+# read_timeout), so an unreachable server fails fast instead of holding a
+# worker for the whole generation budget.
+CONNECT_TIMEOUT = 5
+
+
+def clip_article_text(text: str, limit: int = ARTICLE_CHAR_LIMIT) -> str:
+    """Cut text to about `limit` characters, backing up to a word boundary."""
+    if len(text) <= limit:
+        return text
+    # A word split in half tokenizes into several junk tokens
+    cut = text.rfind(" ", limit - 200, limit)
+    return text[:cut if cut > 0 else limit]
+
+
+def _pooled_session() -> requests.Session:
+    """Keep-alive session for the Ollama HTTP API (every call hits the same host)."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32, pool_maxsize=64, max_retries=Retry(total=3, backoff_factor=0.5)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _ollama_embed_batch(
+    session: requests.Session, base_url: str, model: str, texts: List[str]
+) -> List[List[float]]:
+    """
+    Embed many texts with one /api/embed call. Older Ollama builds lack that
+    endpoint (404), in which case each text goes to /api/embeddings instead.
+    Returns one embedding per input; empty texts and failures give [].
+    """
+    if not texts:
+        return []
+    indices = [i for i, text in enumerate(texts) if text]
+    embeddings: List[List[float]] = [[] for _ in texts]
+    if not indices:
+        return embeddings
+
+    inputs = [texts[i] for i in indices]
+    try:
+        response = session.post(
+            f"{base_url}/api/embed", json={"model": model, "input": inputs}, timeout=(CONNECT_TIMEOUT, 60)
+        )
+        if response.status_code == 404:
+            logger.info("Ollama has no /api/embed; embedding texts one at a time")
+            results = [_ollama_embed_one(session, base_url, model, text) for text in inputs]
+        else:
+            response.raise_for_status()
+            results = response.json().get("embeddings", [])
+    except Exception as exc:
+        logger.error("Batch embedding error: %s", exc)
+        return embeddings
+
+    for i, embedding in zip(indices, results):
+        embeddings[i] = embedding
+    return embeddings
+
+
+def _ollama_embed_one(session: requests.Session, base_url: str, model: str, text: str) -> List[float]:
+    response = session.post(
+        f"{base_url}/api/embeddings", json={"model": model, "prompt": text}, timeout=(CONNECT_TIMEOUT, 30)
+    )
+    response.raise_for_status()
+    return response.json().get("embedding", [])
+
 
 class LLMClient:
     """Unified LLM client supporting Ollama and Kiro ACP."""
@@ -40,6 +159,7 @@ class KiroClient:
     ):
         self.embedding_model = embedding_model
         self.ollama_url = kwargs.get("base_url", "http://localhost:11434")
+        self._session = _pooled_session()
 
         self._cli = KiroCLIClient(
             effort=effort,
@@ -66,13 +186,17 @@ class KiroClient:
         url = f"{self.ollama_url}/api/embeddings"
         payload = {"model": self.embedding_model, "prompt": text}
         try:
-            response = requests.post(url, json=payload, timeout=30)
+            response = self._session.post(url, json=payload, timeout=(CONNECT_TIMEOUT, 30))
             response.raise_for_status()
             return response.json().get("embedding", [])
         except Exception as exc:
             logger.error("Embedding error: %s", exc)
             return []
 
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts in one Ollama request."""
+        return _ollama_embed_batch(self._session, self.ollama_url, self.embedding_model, texts)
+
     def generate_json(self, prompt: str, timeout: int = 300) -> Dict[str, Any]:
         """Send a prompt expecting a JSON response via kiro-cli."""
         return self._cli.prompt_json(prompt, timeout=timeout)
@@ -99,26 +223,17 @@ class KiroClient:
 
     def analyze_article(self, text: str, context: str = "") -> Dict[str, Any]:
         """Analyze article text to get summary, relevance, and impact."""
-        clipped_text = text[:4000]
+        clipped_text = clip_article_text(text)
 
         # Load prompt from yaml
         prompt_template = ""
         try:
-            with open("prompts.yaml", "r") as f:
-                import yaml
-                data = yaml.safe_load(f)
-                prompt_template = data.get("analysis_prompt", "")
+            prompt_template = load_prompt_template()
         except Exception:
             pass
 
         if not prompt_template:
-            prompt_template = (
-                "You are a business intelligence analyst.\n"
-                "SECTION 1: STRATEGIC CONTEXT: {context}\n"
-                "SECTION 2: ARTICLE TEXT: {clipped_text}\n"
-                "TASK: Return JSON with summary, relevance_score (1-10), "
-                "relevance_reasoning, impact_score (1-10), key_entities."
-            )
+            prompt_template = FALLBACK_ANALYSIS_PROMPT
 
         prompt = prompt_template.format(context=context, clipped_text=clipped_text)
         response = self.generate_json(prompt, timeout=300)
@@ -150,18 +265,32 @@ class OllamaClient:
         base_url: str = "http://localhost:11434",
         model: str = "LiquidAI/LFM2.5-1.2B-Instruct",
         embedding_model: str = "nomic-embed-text",
+        cache_dir: Optional[str] = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.model = model
         self.embedding_model = embedding_model
-
-    def check_connection(self) -> bool:
-        """Check if Ollama is reachable."""
+        # When set, analyses and topics are cached on disk by (model, full prompt)
+        # and embeddings by (embedding model, text), so re-running the same
+        # article/context/prompt, or a repost of the same text, skips inference
+        self.cache_dir = cache_dir
+        # warmup, analysis, topics and embeddings all hit the same port, so reuse connections
+        self._session = _pooled_session()
+        self._last_ok_ts = 0.0
+
+    def check_connection(self, ttl: float = 30.0) -> bool:
+        """Check if Ollama is reachable; a success is trusted for `ttl` seconds."""
+        now = time.monotonic()
+        if self._last_ok_ts and now - self._last_ok_ts < ttl:
+            return True
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
-            return response.status_code == 200
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=2)
+            ok = response.status_code == 200
         except requests.exceptions.RequestException:
-            return False
+            ok = False
+        # Failures aren't cached, so a restarted Ollama is picked up on the next probe
+        self._last_ok_ts = now if ok else 0.0
+        return ok
 
     def warmup(self) -> bool:
         """Send a lightweight request to force the model to load into memory."""
@@ -182,42 +311,93 @@ class OllamaClient:
         """Generate vector embedding for a given text."""
         if not text:
             return []
+        if self.cache_dir:
+            # Embeddings are deterministic, so a cached vector is always valid
+            path = self._cache_path("embedding", self.embedding_model, text)
+            cached = self._read_cache(path)
+            if cached is None:
+                cached = self._request_embedding(text)
+                if cached:
+                    self._write_cache(path, cached)
+            return cached
+        return self._request_embedding(text)
+
+    def _request_embedding(self, text: str) -> List[float]:
         url = f"{self.base_url}/api/embeddings"
         payload = {"model": self.embedding_model, "prompt": text}
         try:
-            response = requests.post(url, json=payload, timeout=30)
+            response = self._session.post(url, json=payload, timeout=(CONNECT_TIMEOUT, 30))
             response.raise_for_status()
             return response.json().get("embedding", [])
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
             return []
 
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts in one request, in input order."""
+        if not self.cache_dir:
+            return _ollama_embed_batch(self._session, self.base_url, self.embedding_model, texts)
+
+        paths = [self._cache_path("embedding", self.embedding_model, text) if text else None for text in texts]
+        embeddings = [self._read_cache(path) if path else [] for path in paths]
+        # Only texts without a cached vector go to Ollama
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fresh = _ollama_embed_batch(self._session, self.base_url, self.embedding_model, [texts[i] for i in missing])
+            for i, embedding in zip(missing, fresh):
+                embeddings[i] = embedding
+                if embedding:
+                    self._write_cache(paths[i], embedding)
+        return embeddings
+
     def analyze_article(self, text: str, context: str = "") -> Dict[str, Any]:
         """Analyze article text using the LLM to get summary, relevance, and impact."""
-        clipped_text = text[:4000]
+        prompt = self._analysis_template().format(context=context, clipped_text=clip_article_text(text))
+        return self._analysis_result(self._cached_generate_json(prompt))
+
+    def analyze_articles_batch(
+        self, texts: List[str], context: str = "", max_workers: int = 16
+    ) -> List[Dict[str, Any]]:
+        """Analyze several articles with overlapping requests; results are in input order."""
+        template = self._analysis_template()
+        prompts = [template.format(context=context, clipped_text=clip_article_text(text)) for text in texts]
+        responses = self._map_prompts(self._cached_generate_json, prompts, max_workers)
+        return [self._analysis_result(response) for response in responses]
+
+    def generate_json_batch(self, prompts: List[str], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """generate_json for several prompts concurrently; results are in input order."""
+        return self._map_prompts(self.generate_json, prompts, max_workers)
+
+    @staticmethod
+    def _map_prompts(fn, prompts: List[str], max_workers: int) -> list:
+        if not prompts:
+            return []
+        # Each call spends nearly all its time waiting on Ollama, so threads
+        # overlap the round trips; max_workers caps requests in flight. Prompts
+        # go out longest first: requests Ollama runs side by side are then of
+        # similar length, and a long straggler doesn't start last.
+        order = sorted(range(len(prompts)), key=lambda i: len(prompts[i]), reverse=True)
+        results = [None] * len(prompts)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(prompts)))) as executor:
+            for i, result in zip(order, executor.map(lambda i: fn(prompts[i]), order)):
+                results[i] = result
+        return results
 
+    @staticmethod
+    def _analysis_template() -> str:
         prompt_template = ""
         try:
-            with open("prompts.yaml", "r") as f:
-                import yaml
-                data = yaml.safe_load(f)
-                prompt_template = data.get("analysis_prompt", "")
+            prompt_template = load_prompt_template()
         except Exception as e:
             logger.error(f"Failed to load prompts.yaml: {e}")
 
         if not prompt_template:
             logger.warning("Using fallback prompt")
-            prompt_template = (
-                "You are a business intelligence analyst.\n"
-                "SECTION 1: STRATEGIC CONTEXT: {context}\n"
-                "SECTION 2: ARTICLE TEXT: {clipped_text}\n"
-                "TASK: Return JSON with summary, relevance_score (1-10), "
-                "relevance_reasoning, impact_score (1-10), key_entities."
-            )
-
-        prompt = prompt_template.format(context=context, clipped_text=clipped_text)
-        response = self.generate_json(prompt)
+            prompt_template = FALLBACK_ANALYSIS_PROMPT
+        return prompt_template
 
+    @staticmethod
+    def _analysis_result(response: Dict[str, Any]) -> Dict[str, Any]:
         if not response:
             logger.error("LLM returned empty analysis response")
             return {
@@ -245,13 +425,51 @@ class OllamaClient:
             "Avoid generic words, focus on the main themes.\n\n"
             f"ARTICLE TEXT:\n{clipped_text}"
         )
-        response = self.generate_json(prompt)
+        response = self._cached_generate_json(prompt)
         topics = response.get("topics", []) if response else []
         if not isinstance(topics, list):
             return []
         cleaned = [str(topic).strip() for topic in topics if str(topic).strip()]
         return cleaned[:max_topics]
 
+    def _cached_generate_json(self, prompt: str) -> Dict[str, Any]:
+        """generate_json through the on-disk response cache, if one is configured."""
+        if not self.cache_dir:
+            return self.generate_json(prompt)
+
+        path = self._cache_path(self.model, prompt)
+        cached = self._read_cache(path)
+        if cached is not None:
+            return cached
+
+        response = self.generate_json(prompt)
+        if response:
+            self._write_cache(path, response)
+        return response
+
+    def _cache_path(self, *parts: str) -> str:
+        key = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    @staticmethod
+    def _read_cache(path: str) -> Optional[Any]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None  # Corrupt entry, regenerate
+
+    def _write_cache(self, path: str, value: Any) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Concurrent callers never read a partial entry
+            with atomic_write(path) as tmp_path, open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(JSON_ENCODER.encode(value))
+        except OSError as e:
+            logger.warning(f"Failed to cache LLM response: {e}")
+
     def generate_json(self, prompt: str, timeout: int = 300) -> Dict[str, Any]:
         """Helper to request a JSON-formatted response from Ollama."""
         url = f"{self.base_url}/api/generate"
@@ -260,10 +478,12 @@ class OllamaClient:
             "prompt": prompt,
             "stream": False,
             "format": "json",
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": OLLAMA_OPTIONS,
         }
         try:
             logger.info("⏳ Calling LLM (this may take 30-60 seconds)...")
-            response = requests.post(url, json=payload, timeout=timeout)
+            response = self._session.post(url, json=payload, timeout=(CONNECT_TIMEOUT, timeout))
             response.raise_for_status()
             logger.info("✓ LLM response received")
             result_text = response.json().get("response", "")
@@ -284,9 +504,11 @@ class OllamaClient:
             "model": self.model,
             "prompt": prompt,
             "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": OLLAMA_OPTIONS,
         }
         try:
-            response = requests.post(url, json=payload, timeout=timeout)
+            response = self._session.post(url, json=payload, timeout=(CONNECT_TIMEOUT, timeout))
             response.raise_for_status()
             return response.json().get("response", "")
         except Exception as exc:
@@ -1,16 +1,45 @@
 import os
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Seconds allowed to establish a connection; the read timeout is set per call
+CONNECT_TIMEOUT = 5
+
+
+# JSON wrapped in a markdown code block somewhere inside the reply
+_JSON_FENCE_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+
+
+def _strip_json_fence(content: str) -> str:
+    """Unwrap a ```json ... ``` block, which some models add despite response_format."""
+    content = content.strip()
+    if content.startswith("```"):
+        return content.split("```", 2)[1].removeprefix("json").strip()
+    if content.startswith("{"):
+        return content
+    # Prose before the block ("Here is the JSON: ...") needs a search
+    match = _JSON_FENCE_RE.search(content)
+    return match.group(1) if match else content
+
+
 class OpenRouterClient:
     def __init__(self, model: str = "google/gemini-2.0-flash-001"):
         self.api_key = os.environ.get("OPENROUTER_API_KEY")
         self.base_url = "https://openrouter.ai/api/v1"
         self.model = model
+        # Every call goes to the same HTTPS host; pooling skips a TLS handshake per request
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=3, backoff_factor=0.3)),
+        )
         
         if not self.api_key:
             logger.warning("OPENROUTER_API_KEY not found in environment variables. Verification will be disabled.")
@@ -20,16 +49,45 @@ class OpenRouterClient:
             return False
         try:
             # Simple list models call to check auth
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/models",
                 headers={"Authorization": f"Bearer {self.api_key}"},
-                timeout=10
+                timeout=(CONNECT_TIMEOUT, 10)
             )
             return response.status_code == 200
         except Exception as e:
             logger.error(f"OpenRouter connection check failed: {e}")
             return False
 
+    def chat(self, messages: List[Dict[str, str]], response_format: Optional[Dict] = None,
+             timeout: int = 60, title: str = "NewsFinder Local") -> str:
+        """
+        POST a chat completion and return the first choice's message content.
+        Raises on HTTP errors; callers decide how to degrade.
+        """
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": "http://localhost:5000", # Required by OpenRouter
+            "X-Title": title,
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "model": self.model,
+            "messages": messages,
+        }
+        if response_format:
+            payload["response_format"] = response_format
+
+        response = self._session.post(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=(CONNECT_TIMEOUT, timeout)
+        )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
     def analyze_article(self, text: str, context: str = "") -> Dict[str, Any]:
         """
         Analyze article using OpenRouter model to verify local model's work.
@@ -68,43 +126,18 @@ class OpenRouterClient:
         }}
         """
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "HTTP-Referer": "http://localhost:5000", # Required by OpenRouter
-            "X-Title": "NewsFinder Local",
-            "Content-Type": "application/json"
-        }
-
-        payload = {
-            "model": self.model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-            "response_format": {"type": "json_object"}
-        }
-
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=60
+            content = self.chat(
+                [{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
             )
-            response.raise_for_status()
-            
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
             
-            # Parse JSON from content
+            # Parse JSON from content, unwrapping a markdown fence up front
+            # rather than after a failed parse
             try:
-                result = json.loads(content)
-                return result
+                return json.loads(_strip_json_fence(content))
             except json.JSONDecodeError:
-                # Sometimes models wrap in markdown code blocks despite instructions
-                import re
-                match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL)
-                if match:
-                    return json.loads(match.group(1))
+                logger.warning("OpenRouter returned non-JSON content")
                 return {}
                 
         except Exception as e:
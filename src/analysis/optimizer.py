@@ -1,15 +1,19 @@
 import yaml
 import logging
-import json
-import os
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Tuple
-from src.analysis.llm_client import OllamaClient
+from src.analysis.llm_client import OllamaClient, clip_article_text, load_prompt_template
 from src.analysis.openrouter_client import OpenRouterClient
 from src.analysis.verification_service import VerificationService
+from src.database.chroma_client import NewsDatabase
+from src.document_cache import DocumentCache
+from src.settings import load_config
 
 logger = logging.getLogger(__name__)
 
+# Test cases evaluated against the local LLM at once
+TEST_PROMPT_WORKERS = 4
+
 class PromptOptimizer:
     def __init__(self, config_path: str = "config.yaml", prompts_path: str = "prompts.yaml"):
         self.config_path = config_path
@@ -20,9 +24,8 @@ class PromptOptimizer:
 
     def load_current_prompt(self) -> str:
         try:
-            with open(self.prompts_path, "r") as f:
-                data = yaml.safe_load(f)
-                return data.get("analysis_prompt", "")
+            # Shares the analysis clients' parsed copy; re-read only when the file changes
+            return load_prompt_template(self.prompts_path)
         except Exception as e:
             logger.error(f"Failed to load prompts.yaml: {e}")
             return ""
@@ -31,13 +34,8 @@ class PromptOptimizer:
         """
         Retrieve recent flagged verification records.
         """
-        # We need to read the log file directly or use the service if it exposes what we need
-        # The service exposes get_recent_verifications
-        recent = self.verification_service.get_recent_verifications(limit=100)
-        
-        # Filter for flagged items (discrepancy >= 4)
-        failures = [r for r in recent if r.get("flagged")]
-        return failures[:limit]
+        # Flagged items (discrepancy >= 4) are kept in their own log by the service
+        return self.verification_service.get_recent_flagged(limit=limit)
 
     def generate_optimized_prompt(self, current_prompt: str, failures: List[Dict]) -> str:
         """
@@ -47,8 +45,7 @@ class PromptOptimizer:
             return "Error: OpenRouter API Key missing."
 
         # Load custom rules from config
-        with open(self.config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_config(self.config_path)
         custom_rules = config.get('llm', {}).get('prompt_rules', [])
         rules_section = ""
         if custom_rules:
@@ -88,36 +85,11 @@ class PromptOptimizer:
         Return ONLY the full text of the NEW PROMPT. Do not include markdown formatting like ```yaml or ```text.
         """
         
-        # We use a direct chat completion here since OpenRouterClient.analyze_article is specific to articles
-        # We'll use a raw request helper or add one to OpenRouterClient. 
-        # For now, let's just use requests directly here to avoid modifying OpenRouterClient too much if not needed,
-        # OR we can assume we can add a helper method to OpenRouterClient? 
-        # Actually OpenRouterClient has no generic chat method exposed cleanly. 
-        # Let's add a generic generate method to OpenRouterClient or just implement it here.
-        # Implementation here:
-        
-        import requests
-        headers = {
-            "Authorization": f"Bearer {self.remote_client.api_key}",
-            "HTTP-Referer": "http://localhost:5000",
-            "X-Title": "NewsFinder Optimizer",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": self.remote_client.model,
-            "messages": [{"role": "user", "content": meta_prompt}]
-        }
-        
         try:
-            resp = requests.post(
-                f"{self.remote_client.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=60
+            content = self.remote_client.chat(
+                [{"role": "user", "content": meta_prompt}],
+                title="NewsFinder Optimizer",
             )
-            resp.raise_for_status()
-            content = resp.json()["choices"][0]["message"]["content"]
             
             # Strip markdown code blocks if present
             content = content.replace("```yaml", "").replace("```", "").strip()
@@ -132,108 +104,89 @@ class PromptOptimizer:
         Run the provided prompt against the test cases using the local LLM.
         We need to simulate the `analyze_article` call but injecting the specific prompt.
         """
-        results = []
-        
         # We need to temporarily patch the prompt loading or just manually format it
         # The OllamaClient.analyze_article loads from file. 
         # We can reproduce the formatting logic here.
         
-        for case in test_cases:
-            # We need the full article content? 
-            # The verification log might not have full content. 
-            # Ideally we fetch the article from DB or cache using the URL.
-            # For this prototype, we might have to rely on what's available or fetch.
-            # Verification log only has title/url.
-            # We need to fetch content.
-            
-            # Attempt to fetch from DB?
-            # We don't have DB access here easily without importing Pipeline/DB.
-            # Let's import NewsDatabase
-            from src.database.chroma_client import NewsDatabase
-            db = NewsDatabase()
-            
+        # Need context
+        # Load context from file (once; it's the same for every case)
+        context = ""
+        try:
+            with open("logs/company_context.txt", "r") as f:
+                context = f.read()
+        except Exception:
+            pass
+
+        # We need the full article content? 
+        # The verification log might not have full content. 
+        # Ideally we fetch the article from DB or cache using the URL.
+        # Verification log only has title/url.
+        # We need to fetch content.
+        
+        # Attempt to fetch from DB (one client shared by every case)
+        db = NewsDatabase()
+        # The scraper's document cache keys pages by sha256(url), same as article ids.
+        document_cache = DocumentCache("document-cache")
+
+        def failed(case: Dict, reasoning: str) -> Dict:
+            return {
+                "title": case['article_title'],
+                "old_score": case.get('local_score', 0),
+                "new_score": 0,
+                "target_score": case.get('remote_score', 0),
+                "reasoning": reasoning,
+                "improved": False
+            }
+
+        def run_case(case: Dict) -> Dict:
             # Try to find by URL or we just skip if not found?
             # Or use the URL if we can scrape? No, stick to DB content for speed/consistency.
             # Verification logs have 'article_url'.
             
             # Since we don't store URL as ID directly in Chroma (hashed), we need to re-hash.
-            article_id = hashlib.sha256(case['article_url'].encode("utf-8")).hexdigest()
+            # The same sha256 key addresses the document cache below.
+            article_id = DocumentCache.key_for(case['article_url'])
             article = db.get_article(article_id)
             
             if not article:
-                results.append({
-                    "title": case['article_title'],
-                    "old_score": case.get('local_score', 0),
-                    "new_score": 0,
-                    "target_score": case.get('remote_score', 0),
-                    "reasoning": "Error: Content not found in DB",
-                    "improved": False
-                })
-                continue
+                return failed(case, "Error: Content not found in DB")
                 
-            content = article.get("summary_text", "") # Wait, summary_text is the summary. We want full content? 
             # Chroma stores 'documents' which is Summary. 
             # If we don't store full content in Chroma, we can't fully re-test the prompt generation 
             # because the prompt runs on 'clipped_text' (full content).
             # The pipeline runs analysis on 'content' THEN stores summary.
             # If we don't archive full content, we are stuck.
-            
-            # Archive Manager? Parquet?
-            # We can try to load from cache if available?
-            # 'document-cache' dir has JSONs.
-            cache_path = os.path.join("document-cache", f"{article_id}.json")
-            if os.path.exists(cache_path):
-                with open(cache_path, "r") as f:
-                    cached = json.load(f)
-                    full_text = cached.get("content", "")
-            else:
-                results.append({
-                    "title": case['article_title'],
-                    "old_score": case.get('local_score', 0),
-                    "new_score": 0,
-                    "target_score": case.get('remote_score', 0),
-                    "reasoning": "Error: Full text source not found",
-                    "improved": False
-                })
-                continue
-
-            # Need context
-            # Load context from file
-            context = ""
-            try:
-                with open("logs/company_context.txt", "r") as f:
-                    context = f.read()
-            except:
-                pass
+            cached = document_cache.get_by_key(article_id)
+            if not cached:
+                return failed(case, "Error: Full text source not found")
+            full_text = cached.get("content", "")
 
             # Run Prompt
             try:
-                formatted_prompt = prompt_text.format(context=context, clipped_text=full_text[:4000])
+                formatted_prompt = prompt_text.format(context=context, clipped_text=clip_article_text(full_text))
                 response = self.local_client.generate_json(formatted_prompt)
                 
                 # Compare
                 score = response.get("relevance_score", 0)
                 target = case.get("remote_score", 0)
                 
-                results.append({
+                return {
                     "title": case['article_title'],
                     "old_score": case['local_score'],
                     "new_score": score,
                     "target_score": target,
                     "reasoning": response.get("relevance_reasoning", ""),
                     "improved": abs(score - target) < abs(case['local_score'] - target)
-                })
+                }
             except Exception as e:
-                results.append({
-                    "title": case['article_title'],
-                    "old_score": case.get('local_score', 0),
-                    "new_score": 0,
-                    "target_score": case.get('remote_score', 0),
-                    "reasoning": f"Error: {str(e)}",
-                    "improved": False
-                })
-            
-        return results
+                return failed(case, f"Error: {str(e)}")
+
+        if not test_cases:
+            return []
+        # Each case waits on the local LLM, so run them side by side (Ollama
+        # serves up to OLLAMA_NUM_PARALLEL requests at once); map keeps case order
+        with ThreadPoolExecutor(max_workers=min(TEST_PROMPT_WORKERS, len(test_cases))) as executor:
+            return list(executor.map(run_case, test_cases))
 
     def save_prompt(self, new_prompt: str) -> bool:
         try:
@@ -2,13 +2,21 @@ import json
 import logging
 import random
 import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Optional, List
+from typing import Dict, Iterator, Optional, List
 from src.analysis.openrouter_client import OpenRouterClient
 from src.event_logger import EventLogger
+from src.fileio import JSON_ENCODER, atomic_write
 
 logger = logging.getLogger(__name__)
 
+# Local relevance at or above this is sampled at sample_rate_interesting
+INTERESTING_SCORE = 7
+
 class VerificationService:
     def __init__(self, config: Dict):
         self.config = config.get("verification", {})
@@ -16,7 +24,17 @@ class VerificationService:
         # Use a default model if not configured
         self.client = OpenRouterClient(model=self.config.get("model", "google/gemini-2.0-flash-001"))
         self.log_file = self.config.get("log_file", "logs/verification.jsonl")
+        # Flagged records are also appended here, so failure cases can be read
+        # without scanning the (mostly unflagged) full log
+        self.flagged_log_file = os.path.splitext(self.log_file)[0] + "_flagged.jsonl"
         self.event_logger = EventLogger()
+        # Append handles stay open between records (line-buffered, so readers
+        # still see each record as soon as it's written); verifier threads share them
+        self._log_handles = {}
+        self._log_lock = threading.Lock()
+        # Closes the handles when the service is collected, or at interpreter
+        # exit; holds only the dict, so the service itself can still be freed
+        weakref.finalize(self, _close_handles, self._log_handles)
         
         # Sampling rates
         self.rate_interesting = self.config.get("sample_rate_interesting", 1.0)
@@ -24,17 +42,16 @@ class VerificationService:
 
     def should_verify(self, local_result: Dict) -> bool:
         """Determine if an article should be verified based on sampling rules."""
+        # Disabled is the common case, so it's checked before touching the result
         if not self.enabled or not self.client.api_key:
             return False
-            
+
         # Check if local model thought it was relevant
-        local_score = local_result.get("relevance_score", 0)
-        is_interesting = local_score >= 7
-        
-        if is_interesting:
-            return random.random() < self.rate_interesting
+        if local_result.get("relevance_score", 0) >= INTERESTING_SCORE:
+            rate = self.rate_interesting
         else:
-            return random.random() < self.rate_random
+            rate = self.rate_random
+        return random.random() < rate
 
     def verify(self, article: Dict, local_result: Dict, context: str) -> Optional[Dict]:
         """
@@ -61,8 +78,11 @@ class VerificationService:
         # >= 4 means e.g. 7 (High) vs 3 (Low) or 8 vs 4
         flagged = discrepancy >= 4
         
+        now_ns = time.time_ns()
         verification_record = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # ts_ns gives readers a cheap integer sort key; timestamp stays for display
+            "ts_ns": now_ns,
+            "timestamp": datetime.fromtimestamp(now_ns / 1e9, tz=timezone.utc).isoformat(),
             "article_title": article.get("title"),
             "article_url": article.get("link"),
             "local_model": "local", # Could pull actual name from config if passed
@@ -84,35 +104,125 @@ class VerificationService:
             
         return verification_record
 
+    def verify_many(self, articles: List[Dict], local_results: List[Dict], context: str,
+                    max_workers: int = 8) -> List[Optional[Dict]]:
+        """
+        Verify several articles with their requests in flight at once.
+        Returns one result per article, in input order (None where skipped).
+        """
+        jobs = list(zip(articles, local_results))
+        if not jobs:
+            return []
+        # Each verification is a remote round trip; the client's pooled session
+        # keeps the connections to OpenRouter warm across threads
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            return list(executor.map(lambda job: self.verify(*job, context), jobs))
+
     def _log_verification(self, record: Dict):
         """Append verification record to JSONL log."""
         try:
-            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            line = JSON_ENCODER.encode(record) + "\n"
+            with self._log_lock:
+                if record.get("flagged"):
+                    # Index older records first, so this one isn't copied in twice
+                    self._ensure_flagged_log()
+                self._log_handle(self.log_file).write(line)
+                if record.get("flagged"):
+                    self._log_handle(self.flagged_log_file).write(line)
         except Exception as e:
             logger.error(f"Failed to log verification: {e}")
 
+    def _log_handle(self, path: str):
+        """Open append handle for a log file, created on first use. Caller holds _log_lock."""
+        handle = self._log_handles.get(path)
+        if handle is None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            handle = self._log_handles[path] = open(path, "a", buffering=1, encoding="utf-8")
+        return handle
+
+    def close(self):
+        """Close the open log handles."""
+        with self._log_lock:
+            _close_handles(self._log_handles)
+
     def get_recent_verifications(self, limit: int = 50) -> List[Dict]:
         """Retrieve recent verification logs."""
-        results = []
-        if not os.path.exists(self.log_file):
+        return self._read_recent(self.log_file, limit)
+
+    def get_recent_flagged(self, limit: int = 5) -> List[Dict]:
+        """Retrieve recent flagged verifications (newest first)."""
+        try:
+            with self._log_lock:
+                self._ensure_flagged_log()
+        except Exception as e:
+            logger.error(f"Failed to build flagged verification log: {e}")
+            return []
+        return self._read_recent(self.flagged_log_file, limit)
+
+    def _ensure_flagged_log(self):
+        """Create the flagged sidecar from the full log if it doesn't exist yet."""
+        if os.path.exists(self.flagged_log_file) or not os.path.exists(self.log_file):
+            return
+        with atomic_write(self.flagged_log_file) as tmp_path, \
+                open(self.log_file, "r", encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as dst:
+            for line in src:
+                # Unflagged lines (most of them) are skipped without being parsed;
+                # older records were written with default separators, newer compact
+                if '"flagged":true' not in line and '"flagged": true' not in line:
+                    continue
+                try:
+                    if json.loads(line).get("flagged"):
+                        dst.write(line if line.endswith("\n") else line + "\n")
+                except json.JSONDecodeError:
+                    continue
+
+    @staticmethod
+    def _read_recent(path: str, limit: int) -> List[Dict]:
+        if limit <= 0 or not os.path.exists(path):
             return []
             
+        results = []
         try:
-            with open(self.log_file, "r", encoding="utf-8") as f:
-                # Read all lines
-                lines = f.readlines()
-                # Parse valid JSON lines
-                for line in lines:
-                    try:
-                        if line.strip():
-                            results.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
+            # The log is append-only, so the newest records are at the end:
+            # read backwards and stop after `limit` instead of parsing it all
+            for line in _iter_lines_reverse(path):
+                try:
+                    if line.strip():
+                        results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+                if len(results) >= limit:
+                    break
                         
-            # Sort by timestamp descending (newest first)
-            return sorted(results, key=lambda x: x.get("timestamp", ""), reverse=True)[:limit]
+            # Concurrent verifiers can append slightly out of order, so still
+            # sort the window by timestamp descending (newest first). Records
+            # from before ts_ns existed fall back to their ISO timestamp.
+            if all("ts_ns" in r for r in results):
+                return sorted(results, key=lambda x: x["ts_ns"], reverse=True)
+            return sorted(results, key=lambda x: x.get("timestamp", ""), reverse=True)
         except Exception as e:
             logger.error(f"Error reading verification log: {e}")
             return []
+
+
+def _close_handles(handles: Dict) -> None:
+    for handle in handles.values():
+        handle.close()
+    handles.clear()
+
+
+def _iter_lines_reverse(path: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield the lines of a file last-first, reading it in chunks from the end."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        while position > 0:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # The first piece may be the tail of a line that starts in an earlier chunk
+            remainder = lines.pop(0)
+            yield from reversed(lines)
+        yield remainder
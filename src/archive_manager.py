@@ -1,24 +1,113 @@
 import os
 import glob
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate
 import pandas as pd
-from typing import Optional, Dict, List
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 import dateutil.parser
+from src.fileio import atomic_write
 
 logger = logging.getLogger(__name__)
 
+# Parquet files of one month read at once by _load_month
+LOAD_WORKERS = 8
+
+# ISO-8601 dates start with YYYY-MM-, which is already the month partition
+_ISO_MONTH_RE = re.compile(r"\d{4}-\d{2}-")
+
+
+def _parse_month(date_str: str) -> Optional[str]:
+    """
+    YYYY-MM for a published date, or None if it can't be parsed. ISO and RSS
+    (RFC 2822) dates skip dateutil, which is only used for anything else.
+    """
+    try:
+        if _ISO_MONTH_RE.match(date_str):
+            return date_str[:7]
+        parsed = parsedate(date_str)
+        if parsed:
+            return f"{parsed[0]:04d}-{parsed[1]:02d}"
+        return dateutil.parser.parse(date_str).strftime("%Y-%m")
+    except Exception:
+        return None
+
+
+def _link_to_url(table: pa.Table) -> pa.Table:
+    """
+    Normalize columns: HF has 'link', we use 'url'. Renaming an Arrow table
+    only relabels its schema, no data is copied.
+    """
+    names = table.column_names
+    if 'link' in names and 'url' not in names:
+        table = table.rename_columns(['url' if n == 'link' else n for n in names])
+    return table
+
+
+def _drop_duplicate_urls(table: pa.Table) -> pa.Table:
+    """Keep the last row for each url, in original row order (pandas drop_duplicates keep='last')."""
+    rows = table.append_column("__row", pa.array(range(table.num_rows), type=pa.int64()))
+    last = rows.group_by("url", use_threads=False).aggregate([("__row", "max")])["__row_max"]
+    return table.take(pc.take(last, pc.sort_indices(last)))
+
+
+# Repetitive article fields worth dictionary-encoding. Everything else (url,
+# title, content, ...) is close to unique per row, where a dictionary only
+# costs time before the writer falls back to plain encoding.
+_DICTIONARY_COLUMNS = ("source", "author", "feed", "category", "language")
+
+
+def _write_parquet(table: pa.Table, path: str) -> None:
+    """Write zstd-compressed parquet via a temp file, so readers never see a partial file."""
+    dictionary_columns = [c for c in _DICTIONARY_COLUMNS if c in table.column_names]
+    with atomic_write(path) as tmp_path:
+        pq.write_table(table, tmp_path, compression="zstd", use_dictionary=dictionary_columns or False)
+
+
 class ArchiveManager:
     def __init__(self, archive_dir: str = "data/archive"):
         self.archive_dir = archive_dir
         self._cache = {}  # Map month_str -> DataFrame
+        self._url_index = {}  # Map month_str -> {url: row position}, built on first lookup
+        self._meta_cache = {}  # Map file path -> ((mtime_ns, size), parquet FileMetaData)
+        self._url_locations = {}  # Map month_str -> {url: (file, row group, offset)} for uncached months
 
     def _get_month_path(self, month_str: str) -> List[str]:
         """Get all parquet files for a given month."""
         month_dir = os.path.join(self.archive_dir, month_str)
         if not os.path.exists(month_dir):
             return []
-        return glob.glob(os.path.join(month_dir, "*.parquet"))
+        # Sorted so local.parquet (our appends) comes after the HF data.parquet
+        return sorted(glob.glob(os.path.join(month_dir, "*.parquet")))
+
+    def _open_parquet(self, path: str) -> pq.ParquetFile:
+        """
+        Open a parquet file, reusing its parsed footer while the file is unchanged.
+        Files are memory-mapped, so column chunks decode straight from the page
+        cache instead of being copied into a read buffer first.
+        """
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._meta_cache.get(path)
+        if cached and cached[0] == stamp:
+            return pq.ParquetFile(path, metadata=cached[1], memory_map=True)
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        self._meta_cache[path] = (stamp, parquet_file.metadata)
+        return parquet_file
+
+    def _read_file(self, path: str) -> Optional[pa.Table]:
+        """Read a whole parquet file as an Arrow table, or None if it can't be read."""
+        try:
+            table = self._open_parquet(path).read()
+        except Exception as e:
+            logger.error(f"Error reading {path}: {e}")
+            return None
+        return _link_to_url(table)
 
     def _load_month(self, month_str: str) -> Optional[pd.DataFrame]:
         """Load DataFrame for a month, using memory cache."""
@@ -29,25 +118,24 @@ class ArchiveManager:
         if not files:
             return None
         
-        dfs = []
-        for f in files:
-            try:
-                df = pd.read_parquet(f)
-                # Normalize columns: HF has 'link', we use 'url'
-                if 'link' in df.columns and 'url' not in df.columns:
-                    df = df.rename(columns={'link': 'url'})
-                dfs.append(df)
-            except Exception as e:
-                logger.error(f"Error reading {f}: {e}")
+        if len(files) == 1:
+            tables = [self._read_file(files[0])]
+        else:
+            # pyarrow releases the GIL while decoding, so files read in parallel
+            with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(files))) as executor:
+                tables = list(executor.map(self._read_file, files))
+        tables = [table for table in tables if table is not None]
         
-        if not dfs:
+        if not tables:
             return None
             
         try:
-            combined = pd.concat(dfs, ignore_index=True)
-            # Create index on url for faster lookups
-            if 'url' in combined.columns:
-                combined = combined.set_index('url', drop=False)
+            # Concatenate in Arrow (files may differ in columns, e.g. HF vs local
+            # saves) and convert to pandas once, instead of a DataFrame per file
+            combined_table = pa.concat_tables(tables, promote_options="default")
+            # Drop the per-file tables so self_destruct can free each column as it converts
+            del tables
+            combined = combined_table.to_pandas(self_destruct=True, split_blocks=True)
             self._cache[month_str] = combined
             return combined
         except Exception as e:
@@ -61,11 +149,9 @@ class ArchiveManager:
         """
         months_to_check = []
         if published_date_str:
-            try:
-                dt = dateutil.parser.parse(published_date_str)
-                months_to_check.append(dt.strftime("%Y-%m"))
-            except Exception:
-                pass
+            month = _parse_month(published_date_str)
+            if month:
+                months_to_check.append(month)
         
         # If parsing failed or no date, maybe check current and previous month? 
         # For now, if no date, we can't efficiently search partitioned archive.
@@ -74,22 +160,69 @@ class ArchiveManager:
             months_to_check.append(datetime.now().strftime("%Y-%m"))
 
         for month in months_to_check:
-            df = self._load_month(month)
+            df = self._cache.get(month)
             if df is not None:
-                if url in df.index:
+                row_pos = self._month_url_index(month, df).get(url)
+                if row_pos is not None:
                     # Found it
-                    row = df.loc[url]
-                    # Handle duplicates (if multiple rows have same URL)
-                    if isinstance(row, pd.DataFrame):
-                        row = row.iloc[0]
-                    return row.to_dict()
+                    return df.iloc[row_pos].to_dict()
+                continue
+
+            # Month not in memory: find the row from the url columns alone, then
+            # decode just the row group holding it instead of the whole month
+            location = self._month_url_locations(month).get(url)
+            if location is not None:
+                try:
+                    return self._read_row(*location)
+                except Exception as e:
+                    logger.error(f"Error reading {location[0]}: {e}")
         
         return None
 
-    def get_recent_articles(self, limit: int = 100) -> List[Dict]:
+    def _month_url_locations(self, month_str: str) -> Dict[str, Tuple[str, int, int]]:
+        """url -> (file, row group, offset) for a month, read from the url columns only."""
+        locations = self._url_locations.get(month_str)
+        if locations is None:
+            locations = {}
+            # Walked back to front so a duplicated URL maps to its first row
+            for f in reversed(self._get_month_path(month_str)):
+                try:
+                    parquet_file = self._open_parquet(f)
+                    names = parquet_file.schema_arrow.names
+                    column = 'url' if 'url' in names else 'link' if 'link' in names else None
+                    if column is None:
+                        continue
+                    for group in reversed(range(parquet_file.num_row_groups)):
+                        urls = parquet_file.read_row_group(group, columns=[column]).column(0).to_pylist()
+                        offsets = range(len(urls) - 1, -1, -1)
+                        locations.update(zip(reversed(urls), ((f, group, i) for i in offsets)))
+                except Exception as e:
+                    logger.error(f"Error indexing {f}: {e}")
+            self._url_locations[month_str] = locations
+        return locations
+
+    def _read_row(self, path: str, row_group: int, offset: int) -> Dict:
+        table = self._open_parquet(path).read_row_group(row_group).slice(offset, 1)
+        return _link_to_url(table).to_pandas().iloc[0].to_dict()
+
+    def _month_url_index(self, month_str: str, df: pd.DataFrame) -> Dict[str, int]:
+        """url -> row position for a loaded month, built the first time it's needed."""
+        index = self._url_index.get(month_str)
+        if index is None:
+            if 'url' in df.columns:
+                urls = df['url'].tolist()
+                # Built back to front so a duplicated URL maps to its first row
+                index = dict(zip(reversed(urls), range(len(urls) - 1, -1, -1)))
+            else:
+                index = {}
+            self._url_index[month_str] = index
+        return index
+
+    def get_recent_articles(self, limit: int = 100, columns: Optional[List[str]] = None) -> List[Dict]:
         """
         Get recently archived articles across recent months.
         Useful for replacing the JSON cache listing.
+        columns: Only read these fields (e.g. for listings that don't need content).
         """
         months = sorted(glob.glob(os.path.join(self.archive_dir, "*")), reverse=True)
         articles = []
@@ -99,30 +232,61 @@ class ArchiveManager:
                 continue
             
             month_str = os.path.basename(month_path)
-            df = self._load_month(month_str)
-            if df is None or df.empty:
-                continue
-                
-            # Convert timestamp/published to comparable
-            # We'll just take the tail since we append new stuff
-            # But duplicate handling keeps 'last', so tail is recent.
-            
-            # Convert to list of dicts, reverse to get newest first
-            batch = df.tail(limit - len(articles)).to_dict('records')
-            # Reverse to show newest first
-            articles.extend(reversed(batch))
+            needed = limit - len(articles)
+            df = self._cache.get(month_str)
+            if df is not None:
+                # Already in memory: take the tail since we append new stuff
+                # (duplicate handling keeps 'last', so tail is recent)
+                if columns is not None:
+                    df = df[[c for c in columns if c in df.columns]]
+                # Convert to list of dicts, reverse to get newest first
+                articles.extend(reversed(df.tail(needed).to_dict('records')))
+            else:
+                # Otherwise read just enough trailing row groups, newest file first,
+                # rather than loading the whole month
+                for f in reversed(self._get_month_path(month_str)):
+                    try:
+                        articles.extend(self._tail_records(f, limit - len(articles), columns))
+                    except Exception as e:
+                        logger.error(f"Error reading {f}: {e}")
+                    if len(articles) >= limit:
+                        break
             
             if len(articles) >= limit:
                 break
                 
         return articles[:limit]
 
+    def _tail_records(self, path: str, needed: int, columns: Optional[List[str]] = None) -> List[Dict]:
+        """The last `needed` rows of a parquet file as dicts, newest first."""
+        parquet_file = self._open_parquet(path)
+        names = parquet_file.schema_arrow.names
+        # HF files name the url column 'link'
+        rename = 'link' in names and 'url' not in names
+        read_columns = None
+        if columns is not None:
+            wanted = {'link' if rename and c == 'url' else c for c in columns}
+            read_columns = [n for n in names if n in wanted]
+
+        records = []
+        for i in reversed(range(parquet_file.num_row_groups)):
+            if len(records) >= needed:
+                break
+            table = parquet_file.read_row_group(i, columns=read_columns)
+            if rename:
+                table = _link_to_url(table)
+            take = min(needed - len(records), table.num_rows)
+            batch = table.slice(table.num_rows - take).to_pandas().to_dict('records')
+            records.extend(reversed(batch))
+        return records
+
     def save_articles(self, articles: List[Dict]):
         """
         Save a list of articles to local.parquet in appropriate month folders.
         Batches writes by month.
         """
         by_month = {}
+        default_month = datetime.now().strftime("%Y-%m")
         for art in articles:
             # Normalize link -> url
             if "link" in art and "url" not in art:
@@ -132,13 +296,7 @@ class ArchiveManager:
             
             # Parse date
             date_str = art.get("published")
-            month_str = datetime.now().strftime("%Y-%m") # Default
-            if date_str:
-                try:
-                    dt = dateutil.parser.parse(date_str)
-                    month_str = dt.strftime("%Y-%m")
-                except:
-                    pass
+            month_str = (date_str and _parse_month(date_str)) or default_month
             
             if month_str not in by_month:
                 by_month[month_str] = []
@@ -150,21 +308,25 @@ class ArchiveManager:
             os.makedirs(month_dir, exist_ok=True)
             local_path = os.path.join(month_dir, "local.parquet")
             
-            # Convert to DF
-            new_df = pd.DataFrame(arts)
+            # from_pylist takes its columns from the first row only; use the union
+            # of every row's keys (in first-seen order) so no field is dropped
+            keys = dict.fromkeys(k for art in arts for k in art)
+            new_table = pa.Table.from_pydict({k: [art.get(k) for art in arts] for k in keys})
             # Ensure 'url' is present (should be done above)
             
             # Check if exists to append
             if os.path.exists(local_path):
                 try:
-                    existing_df = pd.read_parquet(local_path)
-                    combined_df = pd.concat([existing_df, new_df]).drop_duplicates(subset=['url'], keep='last')
-                    combined_df.to_parquet(local_path)
+                    existing_table = pq.read_table(local_path)
+                    combined = pa.concat_tables([existing_table, new_table], promote_options="permissive")
+                    _write_parquet(_drop_duplicate_urls(combined), local_path)
                 except Exception as e:
                     logger.error(f"Failed to update {local_path}: {e}")
             else:
-                new_df.to_parquet(local_path)
+                _write_parquet(new_table, local_path)
             
             # Invalidate cache
-            if month_str in self._cache:
-                del self._cache[month_str]
+            self._cache.pop(month_str, None)
+            self._url_index.pop(month_str, None)
+            self._url_locations.pop(month_str, None)
+            self._meta_cache.pop(local_path, None)
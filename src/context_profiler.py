@@ -6,7 +6,7 @@ import json
 import logging
 import os
 from textwrap import dedent
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from bs4 import BeautifulSoup
 
@@ -18,10 +18,13 @@ from src.services.scraper import fetch_company_content
 
 logger = logging.getLogger(__name__)
 
+# Tags _extract_section treats as a self-contained block of copy
+_SECTION_TAGS = ["section", "div", "p", "article"]
+
 
 class CompanyContextProfiler:
-    def __init__(self, config_path: str = "config.yaml"):
-        self.config = load_config(config_path)
+    def __init__(self, config_path: str = "config.yaml", config: Optional[Dict] = None):
+        self.config = config if config is not None else load_config(config_path)
         # Fallback for legacy single-company config if migration failed for some reason, 
         # though settings.py handles it.
         self.companies = self.config.get("companies", [])
@@ -215,14 +218,30 @@ class CompanyContextProfiler:
         return response.text
 
     def _extract_section(self, soup: BeautifulSoup, keywords) -> str:
-        for keyword in keywords:
-            section = soup.find(
-                lambda tag: tag.name in {"section", "div", "p", "article"}
-                and keyword in tag.get_text(strip=True).lower()
+        return self._extract_sections(soup, {"section": keywords})["section"]
+
+    def _extract_sections(self, soup: BeautifulSoup, keyword_groups: Dict[str, List[str]]) -> Dict[str, str]:
+        """
+        Text of the first section matching each group's keywords, in one pass
+        over the page: each candidate's text is extracted and lowercased once and
+        shared by every group, rather than re-walking every tag per keyword. The
+        first keyword (in order) found in any candidate wins, and candidates
+        keep document order.
+        """
+        candidates = [tag.get_text(strip=True) for tag in soup.find_all(_SECTION_TAGS)]
+        lowered = [text.lower() for text in candidates]
+        sections = {}
+        for name, keywords in keyword_groups.items():
+            sections[name] = next(
+                (
+                    text
+                    for keyword in keywords
+                    for text, text_lower in zip(candidates, lowered)
+                    if keyword in text_lower
+                ),
+                "",
             )
-            if section:
-                return section.get_text(strip=True)
-        return ""
+        return sections
 
     def _structure_context(
         self, raw_text: str, company_name: str
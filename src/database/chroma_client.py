@@ -1,11 +1,19 @@
 import chromadb
 from chromadb.config import Settings
 import logging
-from typing import List, Dict, Optional
+from typing import Container, Iterator, List, Dict, Optional
 import os
 
 logger = logging.getLogger(__name__)
 
+# Filled in for rows stored without them, so readers can index fields directly
+ARTICLE_DEFAULTS = {
+    "title": None,
+    "relevance_score": 0,
+    "relevance_reasoning": "",
+    "impact_score": 0,
+}
+
 class NewsDatabase:
     def __init__(self, persist_directory: str = "chroma_db"):
         """
@@ -23,10 +31,8 @@ class NewsDatabase:
         )
         logger.info(f"Connected to ChromaDB at {persist_directory}, collection 'news_articles' ready.")
 
-    def add_article(self, article_id: str, text: str, embedding: List[float], metadata: Dict):
-        """
-        Add an article to the database.
-        """
+    @staticmethod
+    def _clean_metadata(metadata: Dict) -> Dict:
         # Ensure metadata values are primitives (Chroma doesn't support lists in metadata)
         clean_metadata = {}
         for k, v in metadata.items():
@@ -34,18 +40,49 @@ class NewsDatabase:
                 clean_metadata[k] = ", ".join(str(x) for x in v)
             else:
                 clean_metadata[k] = v
-                
+        return clean_metadata
+
+    def add_article(self, article_id: str, text: str, embedding: List[float], metadata: Dict):
+        """
+        Add an article to the database.
+        """
         try:
             self.collection.upsert(
                 ids=[article_id],
                 documents=[text],
                 embeddings=[embedding],
-                metadatas=[clean_metadata]
+                metadatas=[self._clean_metadata(metadata)]
             )
             logger.info(f"Upserted article {article_id} to database.")
         except Exception as e:
             logger.error(f"Error upserting article {article_id}: {e}")
 
+    def add_articles(
+        self,
+        article_ids: List[str],
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict],
+    ) -> bool:
+        """
+        Add several articles in a single upsert.
+        Returns False if the upsert failed (nothing was written).
+        """
+        if not article_ids:
+            return True
+        try:
+            self.collection.upsert(
+                ids=article_ids,
+                documents=texts,
+                embeddings=embeddings,
+                metadatas=[self._clean_metadata(m) for m in metadatas]
+            )
+            logger.info(f"Upserted {len(article_ids)} articles to database.")
+            return True
+        except Exception as e:
+            logger.error(f"Error upserting {len(article_ids)} articles: {e}")
+            return False
+
     def query_articles(self, query_embedding: List[float], n_results: int = 5) -> Dict:
         """
         Search for articles using a vector embedding.
@@ -63,6 +100,16 @@ class NewsDatabase:
         except Exception:
             return False
 
+    def existing_ids(self, article_ids: List[str]) -> set[str]:
+        """Return the subset of IDs already stored, using a single lookup."""
+        if not article_ids:
+            return set()
+        try:
+            result = self.collection.get(ids=list(article_ids), include=[])
+            return set(result.get("ids", []))
+        except Exception:
+            return set()
+
     def get_stats(self):
         """
         Return count of items in collection.
@@ -76,25 +123,65 @@ class NewsDatabase:
         except Exception as e:
             logger.error(f"Error peeking collection: {e}")
             return []
+        articles = self._to_articles(data)
+
+        # Sort by published date desc if available
+        # Note: published_date string format might vary, so this is best effort
+        articles.sort(key=lambda x: x.get("published_date", ""), reverse=True)
+        
+        return articles
+
+    def iter_all_articles(self, page_size: int = 500, exclude_urls: Optional[Container[str]] = None) -> Iterator[Dict]:
+        """
+        Yield every article, one page at a time, so memory stays bounded by
+        page_size rather than collection size. Articles whose url is in
+        exclude_urls are skipped before their documents are fetched.
+        """
+        offset = 0
+        while True:
+            try:
+                if exclude_urls:
+                    scan = self.collection.get(limit=page_size, offset=offset, include=["metadatas"])
+                    keep_ids = [
+                        article_id
+                        for article_id, metadata in zip(scan.get("ids", []), scan.get("metadatas") or [])
+                        if ((metadata or {}).get("url") or (metadata or {}).get("link")) not in exclude_urls
+                    ]
+                    data = (
+                        self.collection.get(ids=keep_ids, include=["documents", "metadatas"])
+                        if keep_ids else {}
+                    )
+                else:
+                    scan = data = self.collection.get(
+                        limit=page_size, offset=offset, include=["documents", "metadatas"]
+                    )
+            except Exception as e:
+                logger.error(f"Error paging collection at offset {offset}: {e}")
+                return
+
+            yield from self._to_articles(data)
+            if len(scan.get("ids", [])) < page_size:
+                return
+            offset += page_size
+
+    @staticmethod
+    def _to_articles(data: Optional[Dict]) -> List[Dict]:
         if not data:
             return []
 
         ids = data.get("ids", [])
-        documents = data.get("documents", [])
-        metadatas = data.get("metadatas", [])
+        documents = data.get("documents") or []
+        metadatas = data.get("metadatas") or []
 
         articles: List[Dict] = []
         for idx, article_id in enumerate(ids):
             metadata = metadatas[idx] if idx < len(metadatas) else {}
             summary = documents[idx] if idx < len(documents) else ""
-            article = {"id": article_id, "summary_text": summary}
+            article = {"id": article_id, "summary_text": summary, **ARTICLE_DEFAULTS}
             article.update(metadata or {})
+            # Older rows were stored under 'link' only
+            article["url"] = article.get("url") or article.get("link")
             articles.append(article)
-
-        # Sort by published date desc if available
-        # Note: published_date string format might vary, so this is best effort
-        articles.sort(key=lambda x: x.get("published_date", ""), reverse=True)
-        
         return articles
 
     def list_recent_articles(self, limit: int = 10) -> List[Dict]:
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from src.fileio import JSON_ENCODER
+
+logger = logging.getLogger(__name__)
+
+DB_FILENAME = "documents.sqlite3"
+
+class DocumentCache:
+    """
+    Scraped article pages, keyed by sha256(url), in a single SQLite file.
+
+    Records are zlib-compressed JSON. Pages cached by older versions as one
+    `<sha256>.json` file per URL are still read (and migrated) on lookup.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, DB_FILENAME), timeout=30, check_same_thread=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "key TEXT PRIMARY KEY, timestamp REAL NOT NULL, data BLOB NOT NULL)"
+            )
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[Dict]:
+        return self.get_by_key(self.key_for(url))
+
+    def get_by_key(self, key: str) -> Optional[Dict]:
+        """Return the cached record for a key, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM documents WHERE key = ?", (key,)
+            ).fetchone()
+        if row:
+            try:
+                return json.loads(zlib.decompress(row[0]))
+            except (zlib.error, ValueError) as e:
+                logger.warning(f"Corrupt document cache entry {key}: {e}")
+                return None
+        return self._migrate_legacy(key)
+
+    def put(self, url: str, record: Dict) -> None:
+        self.put_by_key(self.key_for(url), record)
+
+    def put_by_key(self, key: str, record: Dict) -> None:
+        data = zlib.compress(JSON_ENCODER.encode(record).encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (key, timestamp, data) VALUES (?, ?, ?)",
+                (key, record.get("timestamp", time.time()), data),
+            )
+
+    def _migrate_legacy(self, key: str) -> Optional[Dict]:
+        """Move a pre-SQLite `<key>.json` entry into the store."""
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to read legacy cache file {path}: {e}")
+            return None
+        try:
+            self.put_by_key(key, record)
+            os.unlink(path)
+        except Exception as e:
+            logger.warning(f"Failed to migrate legacy cache file {path}: {e}")
+        return record
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,6 +1,7 @@
 import json
 import os
 import time
+from collections import deque
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 
@@ -40,27 +41,16 @@ class EventLogger:
             
         try:
             with open(self.log_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-                # We want newest first, so reverse the list
-                # Then slice based on offset and limit
-                # lines_reversed = list(reversed(lines)) # Inefficient for huge files but ok for now
-                
-                # Better: iterate backwards using index
-                total_lines = len(lines)
-                start_idx = total_lines - 1 - offset
-                end_idx = start_idx - limit
-                
-                if start_idx < 0:
-                    return []
-                    
-                # Ensure we don't go below index -1
-                stop_idx = max(end_idx, -1)
-                
-                for i in range(start_idx, stop_idx, -1):
-                    try:
-                        events.append(json.loads(lines[i]))
-                    except json.JSONDecodeError:
-                        continue
+                # Newest lines are at the end; keep only the last offset+limit
+                # while streaming instead of loading the whole file
+                tail = deque(f, maxlen=offset + limit) if limit > 0 else ()
+
+            # Newest first, skipping the `offset` most recent
+            for line in list(reversed(tail))[offset:]:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
                         
         except Exception as e:
             print(f"Failed to read event log: {e}")
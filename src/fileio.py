@@ -0,0 +1,27 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+# Built once: json.dumps with non-default options constructs a new encoder per call.
+# Compact separators and raw UTF-8 (no \uXXXX escapes) keep records small.
+JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+@contextmanager
+def atomic_write(path: str) -> Iterator[str]:
+    """
+    Yield a temp path to write in place of `path`, renamed over it on success.
+
+    Readers never see a partial file; if the body raises, the temp file is removed
+    and `path` is left untouched. The temp name is unique per process and thread,
+    so concurrent writers of the same path don't clobber each other's temp file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
@@ -5,8 +5,9 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from src.analysis.llm_client import LLMClient
 from src.aggregator.rss_scraper import RSSNewsAggregator
@@ -19,8 +20,9 @@ logger = logging.getLogger(__name__)
 
 
 class IngestionPipeline:
-    def __init__(self, config_path: str = "config.yaml"):
-        self.config = load_config(config_path)
+    def __init__(self, config_path: str = "config.yaml", config: Optional[Dict] = None):
+        # Callers that already loaded the config can pass it in to skip a reload
+        self.config = config if config is not None else load_config(config_path)
         feeds = self.config.get("feeds", [])
         # Enable document caching to speed up re-runs
         self.aggregator = RSSNewsAggregator(
@@ -34,6 +36,8 @@ class IngestionPipeline:
             model=llm_config.get("model"),
             embedding_model=llm_config.get("embedding_model", "nomic-embed-text"),
             effort=llm_config.get("effort", "low"),
+            # Optional on-disk inference cache (Ollama only); reposted/wire stories reuse results
+            cache_dir=llm_config.get("cache_dir"),
         )
         chroma_dir = self.config["storage"]["chroma_dir"]
         self.db = NewsDatabase(persist_directory=chroma_dir)
@@ -62,54 +66,168 @@ class IngestionPipeline:
         Process a single article: deduplicate, filter, analyze, embed, store.
         Returns a result dict with status and details.
         """
-        result = {
+        result = self._new_result(article)
+
+        # 1. Deduplication
+        article_id = self._article_id(article["link"])
+        if not force and self.db.article_exists(article_id):
+            return self._skip_duplicate(result, article)
+
+        # 2. Keyword Filtering
+        if not force and not self._matches_keywords(article):
+            return self._skip_filtered(result, article)
+
+        # 3-6. LLM Analysis, topics, embedding, metadata
+        metadata, embedding = self._analyze(article, article_id, self._load_company_context())
+
+        # 7. Storage
+        self.db.add_article(
+            article_id=article_id,
+            text=metadata["summary_text"],
+            embedding=embedding,
+            metadata=metadata,
+        )
+
+        # 8. Alerting
+        return self._finish(result, metadata)
+
+    def process_articles_batch(self, articles: List[Dict], max_workers: int = 4) -> List[Dict]:
+        """
+        Process several articles at once. Duplicates are resolved with a single
+        DB lookup, LLM calls run concurrently, and all new articles are stored
+        in one upsert. Returns one result dict per input article, in order.
+        """
+        results = [self._new_result(article) for article in articles]
+        article_ids = [self._article_id(article["link"]) for article in articles]
+        existing = self.db.existing_ids(article_ids)
+
+        pending: List[int] = []
+        seen: set[str] = set()
+        for i, (article, article_id) in enumerate(zip(articles, article_ids)):
+            if article_id in existing or article_id in seen:
+                self._skip_duplicate(results[i], article)
+            elif not self._matches_keywords(article):
+                self._skip_filtered(results[i], article)
+            else:
+                seen.add(article_id)
+                pending.append(i)
+
+        if not pending:
+            return results
+
+        company_context = self._load_company_context()
+
+        def analyze(i: int) -> Optional[Dict]:
+            # One failing LLM call marks just that article, not the whole batch
+            try:
+                return self._analyze_metadata(articles[i], article_ids[i], company_context)
+            except Exception as e:
+                logger.error("Analysis failed for %s: %s", articles[i].get("link"), e)
+                self._mark_error(results[i], f"Analysis failed: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            outcomes = list(executor.map(analyze, pending))
+        analyzed_pairs = [(i, metadata) for i, metadata in zip(pending, outcomes) if metadata is not None]
+        if not analyzed_pairs:
+            return results
+        pending = [i for i, _ in analyzed_pairs]
+        analyzed_metadata = [metadata for _, metadata in analyzed_pairs]
+
+        # One embedding request for the whole batch instead of one per article
+        embeddings = self.llm_client.generate_embeddings(
+            [metadata["summary_text"] for metadata in analyzed_metadata]
+        )
+        # A failed embedding comes back empty, and Chroma would reject the whole
+        # upsert over it, so those articles are reported and left out
+        analyzed = []
+        stored_pending = []
+        for i, metadata, embedding in zip(pending, analyzed_metadata, embeddings):
+            if embedding:
+                analyzed.append((metadata, embedding))
+                stored_pending.append(i)
+            else:
+                self._mark_error(results[i], "Embedding failed")
+        pending = stored_pending
+        if not pending:
+            return results
+
+        stored = self.db.add_articles(
+            article_ids=[article_ids[i] for i in pending],
+            texts=[metadata["summary_text"] for metadata, _ in analyzed],
+            embeddings=[embedding for _, embedding in analyzed],
+            metadatas=[metadata for metadata, _ in analyzed],
+        )
+
+        for i, (metadata, _) in zip(pending, analyzed):
+            if stored:
+                self._finish(results[i], metadata)
+            else:
+                self._mark_error(results[i], "Database write failed")
+        return results
+
+    def _new_result(self, article: Dict) -> Dict:
+        return {
             "status": "pending",
             "title": article.get("title"),
             "url": article.get("link"),
             "reason": None
         }
 
-        # 1. Deduplication
-        article_id = self._article_id(article["link"])
-        if not force and self.db.article_exists(article_id):
-            result["status"] = "skipped"
-            result["reason"] = "Duplicate (already exists in DB)"
-            logger.info("Skipping duplicate article %s", article["link"])
-            return result
+    def _mark_error(self, result: Dict, reason: str) -> Dict:
+        result["status"] = "error"
+        result["reason"] = reason
+        return result
+
+    def _skip_duplicate(self, result: Dict, article: Dict) -> Dict:
+        result["status"] = "skipped"
+        result["reason"] = "Duplicate (already exists in DB)"
+        logger.info("Skipping duplicate article %s", article["link"])
+        return result
+
+    def _skip_filtered(self, result: Dict, article: Dict) -> Dict:
+        result["status"] = "skipped"
+        result["reason"] = "Filtered (no matching keywords)"
+        logger.debug("Skipping article %s due to keyword filter", article.get("title"))
+        return result
 
-        # 2. Keyword Filtering (check title AND content)
+    def _matches_keywords(self, article: Dict) -> bool:
+        """Check title AND content against the configured keywords."""
         keywords = set(
             kw.lower() for kw in self.config["pipeline"].get("keywords", [])
         )
+        if not keywords:
+            return True
         title_lower = article.get("title", "").lower()
         content_lower = article["content"].lower()
         searchable = f"{title_lower} {content_lower}"
-        if not force and keywords and not any(keyword in searchable for keyword in keywords):
-            result["status"] = "skipped"
-            result["reason"] = "Filtered (no matching keywords)"
-            logger.debug("Skipping article %s due to keyword filter", article.get("title"))
-            return result
+        return any(keyword in searchable for keyword in keywords)
 
-        # 2b. Content quality check — if scraped content is garbage, use title
+    def _analyze(self, article: Dict, article_id: str, company_context: str) -> Tuple[Dict, List[float]]:
+        """Run LLM analysis, topic extraction and embedding; return (metadata, embedding)."""
+        metadata = self._analyze_metadata(article, article_id, company_context)
+        embedding = self.llm_client.generate_embedding(metadata["summary_text"])
+        return metadata, embedding
+
+    def _analyze_metadata(self, article: Dict, article_id: str, company_context: str) -> Dict:
+        """Run LLM analysis and topic extraction; return the article metadata."""
+        # Content quality check — if scraped content is garbage, use title
         content_for_analysis = article["content"]
+        content_lower = content_for_analysis.lower()
         garbage_markers = ["we use cookies", "accept all", "javascript is not available", "enable javascript"]
         if len(content_for_analysis) < 200 or any(m in content_lower[:200] for m in garbage_markers):
             content_for_analysis = f"Title: {article.get('title', '')}. Source: {article.get('source', '')}."
             logger.info("Using title-only analysis for %s (content unusable)", article.get("title", "")[:40])
 
-        # 3. LLM Analysis
-        company_context = self._load_company_context()
+        # LLM Analysis
         analysis = self.llm_client.analyze_article(
             content_for_analysis, context=company_context
         )
         
-        # 4. Topic Extraction
+        # Topic Extraction
         topic_tags = self.llm_client.extract_topics(article["content"])
-        
-        # 5. Embedding
-        embedding = self.llm_client.generate_embedding(analysis.get("summary", ""))
 
-        # 6. Metadata Construction
+        # Metadata Construction
         metadata = {
             "id": article_id,
             "url": article["link"],
@@ -127,16 +245,10 @@ class IngestionPipeline:
             "previous_impact_score": article.get("previous_impact_score"),
             "reappraised_count": article.get("reappraised_count", 0),
         }
+        return metadata
 
-        # 7. Storage
-        self.db.add_article(
-            article_id=article_id,
-            text=analysis.get("summary", ""),
-            embedding=embedding,
-            metadata=metadata,
-        )
-
-        # 8. Alerting
+    def _finish(self, result: Dict, metadata: Dict) -> Dict:
+        """Apply alerting rules and mark the result as imported."""
         alert_cfg = self.config["pipeline"].get("alert_threshold", {})
         relevance_cutoff = alert_cfg.get("relevance", 7)
         impact_cutoff = alert_cfg.get("impact", 7)
@@ -0,0 +1,49 @@
+"""Thread-safe token-bucket rate limiter for polite outbound requests."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Allow up to `rate` acquisitions per second, with bursts of up to `burst`.
+
+    Unlike a fixed sleep between requests, time already spent doing work
+    counts towards the budget, so slow requests aren't penalised twice.
+
+    Usage:
+        limiter = RateLimiter(rate=4, burst=4)
+        with limiter:
+            requests.get(url)
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available. A non-positive rate never blocks."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def __enter__(self) -> "RateLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
@@ -36,6 +36,18 @@ def extract_section_by_keywords(soup: BeautifulSoup, keywords: List[str]) -> str
             return section.get_text(strip=True)
     return ""
 
+def _parse_page(content: bytes) -> BeautifulSoup:
+    """
+    Parse a page with lxml's C parser (much faster than html.parser) and drop
+    the parts that aren't copy. The whole tree is kept: the landing page's text
+    and links are both read, so a SoupStrainer can't narrow it.
+    """
+    soup = BeautifulSoup(content, "lxml")
+    # Clean up
+    for script in soup(["script", "style", "nav", "footer"]):
+        script.decompose()
+    return soup
+
 def fetch_company_content(url: str) -> str:
     """
     Scrapes the main landing page and attempts to find an 'About' page.
@@ -55,12 +67,7 @@ def fetch_company_content(url: str) -> str:
         logger.info(f"Scraping landing page: {url}")
         resp = requests.get(url, headers=headers, timeout=10)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.content, "html.parser")
-        
-        # Clean up
-        for script in soup(["script", "style", "nav", "footer"]):
-            script.decompose()
-            
+        soup = _parse_page(resp.content)
         text = soup.get_text(separator=" ", strip=True)
         combined_text += f"--- LANDING PAGE ---\n{text[:5000]}\n\n" # Limit length
         
@@ -83,9 +90,7 @@ def fetch_company_content(url: str) -> str:
             try:
                 resp_about = requests.get(about_link, headers=headers, timeout=10)
                 if resp_about.status_code == 200:
-                    soup_about = BeautifulSoup(resp_about.content, "html.parser")
-                    for script in soup_about(["script", "style", "nav", "footer"]):
-                        script.decompose()
+                    soup_about = _parse_page(resp_about.content)
                     about_text = soup_about.get_text(separator=" ", strip=True)
                     combined_text += f"--- ABOUT PAGE ---\n{about_text[:5000]}\n\n"
             except Exception as e:
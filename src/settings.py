@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import copy
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List
 from urllib.parse import urlparse
@@ -96,6 +97,17 @@ def normalize_feeds(feeds: List[Any]) -> List[Dict[str, str]]:
     return normalized
 
 
+# libyaml's C loader when PyYAML was built with it; shared by every YAML reader
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=4)
+def _read_yaml(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # mtime_ns and size only key the cache, so edits to the file are picked up
+    with open(path, "r", encoding="utf-8") as handle:
+        return yaml.load(handle, Loader=YAML_LOADER) or {}
+
+
 def load_config(path: str | os.PathLike[str] = "config.yaml") -> Dict[str, Any]:
     """Load configuration from disk and merge with defaults."""
 
@@ -103,9 +115,11 @@ def load_config(path: str | os.PathLike[str] = "config.yaml") -> Dict[str, Any]:
     config = copy.deepcopy(DEFAULT_CONFIG)
 
     if config_path.exists():
-        with config_path.open("r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle) or {}
-            _deep_update(config, data)
+        resolved = config_path.resolve()
+        stat = resolved.stat()
+        data = _read_yaml(str(resolved), stat.st_mtime_ns, stat.st_size)
+        # Callers may mutate their config, so never hand out the cached dict
+        _deep_update(config, copy.deepcopy(data))
 
     # Migration: company -> companies
     if "company" in config:
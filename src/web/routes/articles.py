@@ -15,7 +15,10 @@ def articles_view():
     
     # Load cached articles from Parquet archive
     archive_mgr = ArchiveManager()
-    cached_articles = archive_mgr.get_recent_articles(limit=100)
+    # The skipped list only shows these fields, so article bodies aren't read
+    cached_articles = archive_mgr.get_recent_articles(
+        limit=100, columns=["url", "link", "title", "published", "source"]
+    )
     
     # Load History
     history_mgr = HistoryManager()
@@ -1,6 +1,7 @@
 import os
 import json
 import copy
+from collections import deque
 from typing import Dict, Any, List
 from flask import current_app, g
 from urllib.parse import urlparse
@@ -61,7 +62,8 @@ def load_alerts(path: str, limit: int = 5) -> List[Dict[str, Any]]:
 
     alerts: List[Dict[str, Any]] = []
     with open(path, "r", encoding="utf-8") as handle:
-        for line in handle.readlines()[-limit:]:
+        # Only the last `limit` lines are kept while streaming the file
+        for line in deque(handle, maxlen=limit):
             try:
                 alerts.append(json.loads(line.strip()))
             except json.JSONDecodeError:
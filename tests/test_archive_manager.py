@@ -88,6 +88,62 @@ def test_get_article_no_date_fallback(archive_manager):
     assert retrieved is not None
     assert retrieved["title"] == "Now Article"
 
+def test_save_articles_keeps_keys_missing_from_first_row(archive_manager):
+    archive_manager.save_articles([
+        {"url": "http://example.com/1", "published": "2023-10-01", "title": "One"},
+        {"url": "http://example.com/2", "published": "2023-10-02", "title": "Two", "author": "Z"},
+    ])
+
+    assert archive_manager.get_article("http://example.com/2", "2023-10-02")["author"] == "Z"
+    assert pd.isna(archive_manager.get_article("http://example.com/1", "2023-10-01")["author"])
+
 def test_get_article_not_found(archive_manager):
     retrieved = archive_manager.get_article("http://nonexistent.com")
     assert retrieved is None
+
+def test_load_month_reuses_parquet_metadata(archive_manager):
+    archive_manager.save_articles([{"url": "http://example.com/1", "published": "2023-10-01", "title": "One"}])
+    archive_manager._load_month("2023-10")
+    archive_manager._cache.clear()
+
+    path = os.path.join(archive_manager.archive_dir, "2023-10", "local.parquet")
+    cached_meta = archive_manager._meta_cache[path][1]
+    archive_manager._load_month("2023-10")
+    assert archive_manager._meta_cache[path][1] is cached_meta
+
+    # Saving rewrites the file, so its footer is parsed again
+    archive_manager.save_articles([{"url": "http://example.com/2", "published": "2023-10-02", "title": "Two"}])
+    assert archive_manager.get_article("http://example.com/2", "2023-10-02")["title"] == "Two"
+    assert archive_manager._meta_cache[path][1] is not cached_meta
+
+def test_get_recent_articles_reads_tail_row_groups(archive_manager):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    month_dir = os.path.join(archive_manager.archive_dir, "2023-09")
+    os.makedirs(month_dir)
+    # HF mirror layout: 'link' instead of 'url', several row groups
+    table = pa.table({"link": [f"http://example.com/{i}" for i in range(10)], "title": [str(i) for i in range(10)], "content": ["x"] * 10})
+    pq.write_table(table, os.path.join(month_dir, "data.parquet"), row_group_size=3)
+
+    recent = archive_manager.get_recent_articles(limit=4, columns=["url", "title"])
+
+    assert [r["title"] for r in recent] == ["9", "8", "7", "6"]
+    assert recent[0] == {"url": "http://example.com/9", "title": "9"}
+
+def test_get_article_reads_single_row_group(archive_manager):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    month_dir = os.path.join(archive_manager.archive_dir, "2023-09")
+    os.makedirs(month_dir)
+    links = [f"http://example.com/{i}" for i in range(10)] + ["http://example.com/3"]
+    table = pa.table({"link": links, "title": [str(i) for i in range(11)]})
+    pq.write_table(table, os.path.join(month_dir, "data.parquet"), row_group_size=4)
+
+    retrieved = archive_manager.get_article("http://example.com/3", "2023-09-05")
+
+    # First row wins for a duplicated URL, and the month is never fully loaded
+    assert retrieved == {"url": "http://example.com/3", "title": "3"}
+    assert archive_manager.get_article("http://example.com/9", "2023-09-05")["title"] == "9"
+    assert "2023-09" not in archive_manager._cache
@@ -0,0 +1,18 @@
+from src.bloom import BloomFilter
+
+def test_added_items_are_always_found():
+    bloom = BloomFilter(capacity=1000)
+    urls = [f"http://example.com/{i}" for i in range(1000)]
+    bloom.update(urls)
+    assert all(url in bloom for url in urls)
+
+def test_false_positive_rate_stays_near_target():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    bloom.update(f"http://example.com/{i}" for i in range(1000))
+    false_hits = sum(f"http://other.com/{i}" in bloom for i in range(10000))
+    assert false_hits < 300
+
+def test_non_strings_are_never_members():
+    bloom = BloomFilter(capacity=10)
+    bloom.add("None")
+    assert None not in bloom
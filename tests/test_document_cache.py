@@ -0,0 +1,20 @@
+import json
+from src.document_cache import DocumentCache
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = DocumentCache(str(tmp_path))
+    record = {"url": "http://test.com/a", "timestamp": 1.0, "content": "Body text"}
+    cache.put("http://test.com/a", record)
+    assert cache.get("http://test.com/a") == record
+    assert cache.get_by_key(DocumentCache.key_for("http://test.com/a")) == record
+    assert cache.get("http://test.com/missing") is None
+
+def test_legacy_json_files_are_migrated(tmp_path):
+    key = DocumentCache.key_for("http://test.com/old")
+    legacy = tmp_path / f"{key}.json"
+    legacy.write_text(json.dumps({"content": "Old body", "timestamp": 1.0}))
+
+    cache = DocumentCache(str(tmp_path))
+    assert cache.get("http://test.com/old")["content"] == "Old body"
+    assert not legacy.exists()
+    assert cache.get("http://test.com/old")["content"] == "Old body"
@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from src.fileio import atomic_write
+
+
+def test_atomic_write_replaces_target(tmp_path):
+    path = str(tmp_path / "out.json")
+    with atomic_write(path) as tmp:
+        with open(tmp, "w") as f:
+            f.write("new")
+    assert open(path).read() == "new"
+    assert os.listdir(tmp_path) == ["out.json"]
+
+
+def test_atomic_write_keeps_target_on_error(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_text("old")
+    with pytest.raises(ValueError):
+        with atomic_write(str(path)) as tmp:
+            with open(tmp, "w") as f:
+                f.write("partial")
+            raise ValueError("boom")
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["out.json"]
@@ -0,0 +1,8 @@
+import json
+from src.analysis.openrouter_client import _strip_json_fence
+
+def test_strip_json_fence_handles_leading_and_embedded_blocks():
+    assert json.loads(_strip_json_fence('{"relevance_score": 2}')) == {"relevance_score": 2}
+    assert json.loads(_strip_json_fence('```json\n{"relevance_score": 3}\n```')) == {"relevance_score": 3}
+    reply = 'Here is the JSON:\n```json\n{"relevance_score": 4}\n```\nLet me know.'
+    assert json.loads(_strip_json_fence(reply)) == {"relevance_score": 4}
@@ -28,16 +28,15 @@ def mock_config():
 def mock_deps():
     with patch("src.pipeline.load_config") as mock_load_config, \
          patch("src.pipeline.RSSNewsAggregator") as MockAggregator, \
-         patch("src.pipeline.OllamaClient") as MockOllama, \
-         patch("src.pipeline.VerificationService") as MockVerification, \
+         patch("src.pipeline.LLMClient") as MockLLMClient, \
          patch("src.pipeline.NewsDatabase") as MockDB, \
          patch("src.pipeline.HistoryManager") as MockHistory:
         
         yield {
             "load_config": mock_load_config,
             "RSSNewsAggregator": MockAggregator,
-            "OllamaClient": MockOllama,
-            "VerificationService": MockVerification,
+            # LLMClient.create() is a factory; expose the client it returns
+            "OllamaClient": MockLLMClient.create,
             "NewsDatabase": MockDB,
             "HistoryManager": MockHistory
         }
@@ -158,3 +157,109 @@ def test_reprocess_article_not_found(pipeline, mock_deps):
     
     result = pipeline.reprocess_article("missing")
     assert result["status"] == "error"
+
+def test_process_articles_batch(pipeline, mock_deps):
+    mock_db_instance = mock_deps["NewsDatabase"].return_value
+    dup_id = pipeline._article_id("http://test.com/dup")
+    mock_db_instance.existing_ids.return_value = {dup_id}
+
+    mock_llm_instance = mock_deps["OllamaClient"].return_value
+    mock_llm_instance.analyze_article.return_value = {
+        "summary": "Summary",
+        "relevance_score": 3,
+        "impact_score": 3,
+    }
+    mock_llm_instance.extract_topics.return_value = []
+    mock_llm_instance.generate_embeddings.side_effect = lambda texts: [[0.1] for _ in texts]
+
+    base = {"published": "2023-01-01", "source": "Source"}
+    articles = [
+        {"link": "http://test.com/dup", "title": "Dup", "content": "test content", **base},
+        {"link": "http://test.com/filter", "title": "Filter", "content": "boring content", **base},
+        {"link": "http://test.com/a", "title": "A", "content": "test content a", **base},
+        {"link": "http://test.com/b", "title": "B", "content": "test content b", **base},
+    ]
+
+    with patch("builtins.open", mock_open(read_data="Context")):
+        results = pipeline.process_articles_batch(articles)
+
+    assert [r["status"] for r in results] == ["skipped", "skipped", "imported", "imported"]
+    mock_db_instance.existing_ids.assert_called_once()
+    mock_db_instance.article_exists.assert_not_called()
+    # New articles are stored with a single upsert
+    mock_db_instance.add_articles.assert_called_once()
+    kwargs = mock_db_instance.add_articles.call_args.kwargs
+    assert kwargs["article_ids"] == [pipeline._article_id("http://test.com/a"), pipeline._article_id("http://test.com/b")]
+    # ...and embedded with a single request
+    mock_llm_instance.generate_embeddings.assert_called_once_with(["Summary", "Summary"])
+    assert kwargs["embeddings"] == [[0.1], [0.1]]
+
+def test_process_articles_batch_isolates_analysis_errors(pipeline, mock_deps):
+    mock_db_instance = mock_deps["NewsDatabase"].return_value
+    mock_db_instance.existing_ids.return_value = set()
+
+    mock_llm_instance = mock_deps["OllamaClient"].return_value
+
+    def analyze(text, context=""):
+        if "boom" in text:
+            raise RuntimeError("LLM timeout")
+        return {"summary": "Summary", "relevance_score": 3, "impact_score": 3}
+
+    mock_llm_instance.analyze_article.side_effect = analyze
+    mock_llm_instance.extract_topics.return_value = []
+    mock_llm_instance.generate_embeddings.side_effect = lambda texts: [[0.1] for _ in texts]
+
+    base = {"published": "2023-01-01", "source": "Source"}
+    articles = [
+        {"link": f"http://test.com/{name}", "title": name, "content": f"test content {name} " * 20, **base}
+        for name in ("a", "boom", "c")
+    ]
+
+    with patch("builtins.open", mock_open(read_data="Context")):
+        results = pipeline.process_articles_batch(articles)
+
+    assert [r["status"] for r in results] == ["imported", "error", "imported"]
+    assert "LLM timeout" in results[1]["reason"]
+    kwargs = mock_db_instance.add_articles.call_args.kwargs
+    assert kwargs["article_ids"] == [pipeline._article_id("http://test.com/a"), pipeline._article_id("http://test.com/c")]
+
+def test_process_articles_batch_reports_failed_upsert(pipeline, mock_deps):
+    mock_db_instance = mock_deps["NewsDatabase"].return_value
+    mock_db_instance.existing_ids.return_value = set()
+    mock_db_instance.add_articles.return_value = False
+
+    mock_llm_instance = mock_deps["OllamaClient"].return_value
+    mock_llm_instance.analyze_article.return_value = {"summary": "Summary", "relevance_score": 3, "impact_score": 3}
+    mock_llm_instance.extract_topics.return_value = []
+    mock_llm_instance.generate_embeddings.side_effect = lambda texts: [[0.1] for _ in texts]
+
+    articles = [{"link": "http://test.com/a", "title": "A", "content": "test content", "published": "2023-01-01", "source": "Source"}]
+
+    with patch("builtins.open", mock_open(read_data="Context")):
+        results = pipeline.process_articles_batch(articles)
+
+    assert results[0]["status"] == "error"
+    assert results[0]["reason"] == "Database write failed"
+
+def test_process_articles_batch_skips_empty_embeddings(pipeline, mock_deps):
+    mock_db_instance = mock_deps["NewsDatabase"].return_value
+    mock_db_instance.existing_ids.return_value = set()
+
+    mock_llm_instance = mock_deps["OllamaClient"].return_value
+    mock_llm_instance.analyze_article.return_value = {"summary": "Summary", "relevance_score": 3, "impact_score": 3}
+    mock_llm_instance.extract_topics.return_value = []
+    mock_llm_instance.generate_embeddings.return_value = [[0.1], []]
+
+    base = {"published": "2023-01-01", "source": "Source"}
+    articles = [
+        {"link": "http://test.com/a", "title": "A", "content": "test content a", **base},
+        {"link": "http://test.com/b", "title": "B", "content": "test content b", **base},
+    ]
+
+    with patch("builtins.open", mock_open(read_data="Context")):
+        results = pipeline.process_articles_batch(articles)
+
+    assert [r["status"] for r in results] == ["imported", "error"]
+    assert results[1]["reason"] == "Embedding failed"
+    kwargs = mock_db_instance.add_articles.call_args.kwargs
+    assert kwargs["article_ids"] == [pipeline._article_id("http://test.com/a")]
@@ -0,0 +1,25 @@
+import time
+from src.rate_limiter import RateLimiter
+
+def test_burst_does_not_block():
+    limiter = RateLimiter(rate=1, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.1
+
+def test_blocks_once_bucket_is_empty():
+    limiter = RateLimiter(rate=20, burst=1)
+    start = time.monotonic()
+    for _ in range(3):
+        with limiter:
+            pass
+    # Two refills at 20/s is roughly 0.1s
+    assert time.monotonic() - start >= 0.09
+
+def test_zero_rate_is_unlimited():
+    limiter = RateLimiter(rate=0)
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.1
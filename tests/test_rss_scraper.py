@@ -14,7 +14,7 @@ def aggregator(mock_archive_manager, tmp_path):
     return RSSNewsAggregator(feed_urls=["http://feed.com/rss"], cache_dir=str(tmp_path))
 
 def test_fetch_feed_success(aggregator):
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_response = MagicMock()
         mock_response.content = b"<rss>...</rss>"
         mock_get.return_value = mock_response
@@ -30,7 +30,7 @@ def test_fetch_feed_success(aggregator):
             mock_parse.assert_called_once()
 
 def test_fetch_feed_network_error(aggregator):
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.side_effect = Exception("Network Down")
         
         feed, error = aggregator._fetch_feed("http://feed.com/rss")
@@ -92,7 +92,7 @@ def test_clean_summary(aggregator):
     clean = aggregator._clean_summary(raw)
     assert clean == "Summary text"
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_scrape_article_content_basic(mock_get, aggregator):
     html_content = """
     <html>
@@ -103,9 +103,9 @@ def test_scrape_article_content_basic(mock_get, aggregator):
         </body>
     </html>
     """
-    mock_response = MagicMock()
-    mock_response.content = html_content.encode("utf-8")
-    mock_get.return_value = mock_response
+    mock_response = MagicMock(headers={"content-type": "text/html; charset=utf-8"})
+    mock_response.raw.read.return_value = html_content.encode("utf-8")
+    mock_get.return_value.__enter__.return_value = mock_response
     
     # Ensure archive miss
     aggregator.archive_manager.get_article.return_value = None
@@ -116,7 +116,7 @@ def test_scrape_article_content_basic(mock_get, aggregator):
     assert "Paragraph 1." in content
     assert "Paragraph 2." in content
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_scrape_article_content_archive_hit(mock_get, aggregator):
     # Setup archive hit
     aggregator.archive_manager.get_article.return_value = {"content": "Archived Content"}
@@ -128,10 +128,10 @@ def test_scrape_article_content_archive_hit(mock_get, aggregator):
 
 def test_scrape_article_content_short_content(aggregator):
     # Mock requests to return very short content
-    with patch("requests.get") as mock_get:
-        mock_response = MagicMock()
-        mock_response.content = b"<html><body><p>Too short.</p></body></html>"
-        mock_get.return_value = mock_response
+    with patch("requests.Session.get") as mock_get:
+        mock_response = MagicMock(headers={"content-type": "text/html"})
+        mock_response.raw.read.return_value = b"<html><body><p>Too short.</p></body></html>"
+        mock_get.return_value.__enter__.return_value = mock_response
         
         aggregator.archive_manager.get_article.return_value = None
         
@@ -139,3 +139,44 @@ def test_scrape_article_content_short_content(aggregator):
         
         # Should return empty string if length < 200 (as per implementation)
         assert content == ""
+
+def test_fetch_feed_reuses_body_on_not_modified(aggregator):
+    rss = b"<rss><channel><item><title>A</title><link>http://test.com/a</link></item></channel></rss>"
+    first = MagicMock(status_code=200, headers={"ETag": '"v1"', "content-type": "application/rss+xml"})
+    first.raw.read.return_value = rss
+    not_modified = MagicMock(status_code=304, headers={})
+
+    with patch("requests.Session.get", side_effect=[first, not_modified]) as mock_get:
+        aggregator._fetch_feed("http://feed.com/rss")
+        feed, error = aggregator._fetch_feed("http://feed.com/rss")
+
+    assert error == ""
+    assert [entry.link for entry in feed.entries] == ["http://test.com/a"]
+    assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+
+@patch("requests.Session.get")
+def test_scrape_article_content_skips_oversized_pages(mock_get, aggregator):
+    mock_response = MagicMock(headers={"content-type": "text/html", "content-length": "50000000"})
+    mock_get.return_value.__enter__.return_value = mock_response
+    aggregator.archive_manager.get_article.return_value = None
+
+    assert aggregator._scrape_article_content("http://test.com/huge") == ""
+    mock_response.raw.read.assert_not_called()
+
+def test_extractor_lookup_matches_subdomains():
+    from src.aggregator.rss_scraper import _extract_bbc, _extract_guardian, _extractor_for
+
+    assert _extractor_for("m.bbc.co.uk") is _extract_bbc
+    assert _extractor_for("www.bbc.com") is _extract_bbc
+    assert _extractor_for("amp.theguardian.com") is _extract_guardian
+    assert _extractor_for("notbbc.com") is None
+
+def test_guardian_extractor_prefers_commercial_body():
+    import lxml.html
+    from src.aggregator.rss_scraper import _extract_guardian
+
+    tree = lxml.html.fromstring(
+        '<html><body><div data-gu-name="body"><p>fallback</p></div>'
+        '<div class="article-body-commercial-selector x"><p>main</p></div></body></html>'
+    )
+    assert [p.text for p in _extract_guardian(tree)] == ["main"]
@@ -0,0 +1,86 @@
+import json
+from src.analysis.verification_service import VerificationService
+
+def make_service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    log_file = tmp_path / "verification.jsonl"
+    return VerificationService({"verification": {"log_file": str(log_file)}}), log_file
+
+def test_recent_verifications_reads_newest_first(tmp_path, monkeypatch):
+    service, log_file = make_service(tmp_path, monkeypatch)
+    records = [{"timestamp": f"2024-01-01T00:00:{i:02d}", "article_title": "x" * 5000} for i in range(60)]
+    log_file.write_text("".join(json.dumps(r) + "\n" for r in records) + "not json\n")
+
+    recent = service.get_recent_verifications(limit=5)
+
+    assert [r["timestamp"] for r in recent] == [r["timestamp"] for r in records[:-6:-1]]
+
+def test_recent_verifications_returns_all_when_under_limit(tmp_path, monkeypatch):
+    service, log_file = make_service(tmp_path, monkeypatch)
+    log_file.write_text('{"timestamp": "a"}\n{"timestamp": "b"}')
+
+    assert [r["timestamp"] for r in service.get_recent_verifications(limit=50)] == ["b", "a"]
+
+def test_recent_verifications_non_positive_limit(tmp_path, monkeypatch):
+    service, log_file = make_service(tmp_path, monkeypatch)
+    log_file.write_text('{"timestamp": "a"}\n{"timestamp": "b"}\n')
+
+    assert service.get_recent_verifications(limit=0) == []
+    assert service.get_recent_verifications(limit=-1) == []
+
+def test_flagged_records_go_to_sidecar(tmp_path, monkeypatch):
+    service, log_file = make_service(tmp_path, monkeypatch)
+    # Pre-existing log without a sidecar is indexed on first read
+    log_file.write_text('{"timestamp": "a", "flagged": true}\n{"timestamp": "b", "flagged": false}\n')
+
+    assert [r["timestamp"] for r in service.get_recent_flagged()] == ["a"]
+
+    service._log_verification({"timestamp": "c", "flagged": True})
+    service._log_verification({"timestamp": "d", "flagged": False})
+
+    assert [r["timestamp"] for r in service.get_recent_flagged()] == ["c", "a"]
+    assert len(service.get_recent_verifications()) == 4
+
+def test_first_flagged_record_is_not_duplicated(tmp_path, monkeypatch):
+    service, log_file = make_service(tmp_path, monkeypatch)
+    log_file.write_text('{"timestamp": "a", "flagged": false}\n')
+
+    service._log_verification({"timestamp": "b", "flagged": True})
+
+    assert [r["timestamp"] for r in service.get_recent_flagged()] == ["b"]
+
+def test_recent_verifications_sort_on_ts_ns(tmp_path, monkeypatch):
+    service, log_file = make_service(tmp_path, monkeypatch)
+    log_file.write_text('{"ts_ns": 2, "timestamp": "b"}\n{"ts_ns": 10, "timestamp": "c"}\n{"ts_ns": 1, "timestamp": "a"}\n')
+
+    assert [r["ts_ns"] for r in service.get_recent_verifications()] == [10, 2, 1]
+
+def test_verify_many_keeps_input_order(tmp_path, monkeypatch):
+    service, _ = make_service(tmp_path, monkeypatch)
+    service.enabled = True
+    service.rate_random = 1.0
+    service.client.api_key = "key"
+    monkeypatch.setattr(service.client, "analyze_article", lambda text, context: {"relevance_score": int(text)})
+
+    results = service.verify_many(
+        [{"title": str(i), "content": str(i)} for i in range(5)],
+        [{"relevance_score": 0}] * 5,
+        "context",
+    )
+
+    assert [r["remote_score"] for r in results] == [0, 1, 2, 3, 4]
+
+def test_log_handles_close_when_service_is_collected(tmp_path, monkeypatch):
+    import gc
+    import weakref
+
+    service, log_file = make_service(tmp_path, monkeypatch)
+    service._log_verification({"timestamp": "a", "flagged": False})
+    handle = service._log_handles[str(log_file)]
+    ref = weakref.ref(service)
+
+    del service
+    gc.collect()
+
+    assert ref() is None
+    assert handle.closed